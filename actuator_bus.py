@@ -0,0 +1,170 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+BUS_IO_WORKERS = 4   # blocking HTTP calls in flight across *all* controllers
+
+
+class DeviceLane:
+    """Per-controller state on the bus: its command channel, sender and limits"""
+
+    def __init__(self, name, channel, send, max_in_flight=1, timeout=2.0):
+        self.name = name
+        self.channel = channel
+        self.send = send
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.semaphore = None
+        self.drain_task = None
+        self.timeouts = 0
+        self.errors = 0
+
+
+class ActuatorBus:
+    """One asyncio event loop that dispatches commands to every ESP32 controller.
+
+    Each registered device gets a lane: its CommandChannel is drained by a
+    coroutine on the shared loop, so LED, gesture and any future boards are
+    served concurrently without a worker thread per device. State commands
+    for a board go out one at a time and in order; other commands overlap,
+    and a semaphore caps how many requests may be in flight to each board.
+    Every call has a timeout. The blocking HTTP call itself runs on a small executor shared
+    by all lanes; a call that times out keeps its slot until that request
+    really ends. submit() is safe to use from any thread.
+    """
+
+    def __init__(self, io_workers=BUS_IO_WORKERS):
+        self.io_workers = io_workers
+        self.lanes = {}
+        self.loop = None
+        self._thread = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the event loop thread once; later calls are free"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self.loop = asyncio.new_event_loop()
+            self._executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="actuator-io")
+            self.loop.set_default_executor(self._executor)
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,), daemon=True, name="actuator-bus")
+            self._thread.start()
+            ready.wait()
+            print("[BUS] Actuator bus started")
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def register(self, name, channel, send, max_in_flight=1, timeout=2.0):
+        """
+        Attach a controller to the bus (re-registering an existing name is a no-op)
+
+        Args:
+            name (str): Device name, e.g. "gesture"
+            channel (CommandChannel): Where submitted commands wait
+            send (callable): Blocking send(command) -> bool
+            max_in_flight (int): Concurrent requests allowed to this board (state commands
+                still go one at a time)
+            timeout (float): Seconds before a call is abandoned
+        """
+        self.start()
+        with self._lock:
+            if name not in self.lanes:
+                self.lanes[name] = DeviceLane(name, channel, send, max_in_flight, timeout)
+        return self.lanes[name]
+
+    def submit(self, name, command, state=True):
+        """Queue a command for a device from any thread; returns False if it was coalesced away"""
+        lane = self.lanes[name]
+        if not lane.channel.put(command, state=state):
+            return False
+        self.loop.call_soon_threadsafe(self._kick, lane)
+        return True
+
+    def resync(self, name):
+        """Re-offer a device's newest state, e.g. after commands were refused while it was down"""
+        lane = self.lanes.get(name)
+        if lane is None or lane.channel.desired is None:
+            return False
+        return self.submit(name, lane.channel.desired)
+
+    def _kick(self, lane):
+        if lane.drain_task is None or lane.drain_task.done():
+            lane.drain_task = self.loop.create_task(self._drain(lane))
+
+    async def _drain(self, lane):
+        # One drain per lane keeps state commands for a board in order
+        if lane.semaphore is None:
+            lane.semaphore = asyncio.Semaphore(lane.max_in_flight)
+        in_flight = set()
+        while True:
+            item = lane.channel.get_item(timeout=0)
+            if item is None:
+                if not in_flight:
+                    return
+                await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            command, state = item
+            # Take a slot before the next command leaves the channel, so waiting ones can still coalesce
+            await lane.semaphore.acquire()
+            if state:
+                await self._send(lane, command)
+            else:
+                send = self.loop.create_task(self._send(lane, command))
+                in_flight.add(send)
+                send.add_done_callback(in_flight.discard)
+
+    async def _send(self, lane, command):
+        ok = await self._run(lane, lane.send, command)
+        lane.channel.task_done(command, ok)
+
+    async def _run(self, lane, fn, *args):
+        """Run fn on the executor in a slot the caller already holds"""
+        call = self.loop.run_in_executor(None, fn, *args)
+        # The executor thread can't be cancelled, so the slot is only freed when the request really ends
+        call.add_done_callback(lambda done: self._release(lane, done))
+        try:
+            return await asyncio.wait_for(asyncio.shield(call), lane.timeout)
+        except asyncio.TimeoutError:
+            lane.timeouts += 1
+            print(f"[BUS] {lane.name}: call timed out after {lane.timeout:.1f}s")
+        except Exception as e:
+            lane.errors += 1
+            print(f"[BUS] {lane.name}: call failed: {e}")
+        return False
+
+    @staticmethod
+    def _release(lane, done):
+        if not done.cancelled():
+            done.exception()  # retrieved, so an abandoned call's error isn't reported as unhandled
+        lane.semaphore.release()
+
+    def flush(self, name, timeout=None):
+        """Block until everything already submitted for a device has been sent"""
+        lane = self.lanes.get(name)
+        if lane is None or self.loop is None:
+            return True
+
+        async def wait_idle():
+            while lane.drain_task is not None and not lane.drain_task.done():
+                await asyncio.shield(lane.drain_task)
+
+        future = asyncio.run_coroutine_threadsafe(wait_idle(), self.loop)
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def stats(self):
+        return {name: dict(lane.channel.stats(), timeouts=lane.timeouts, errors=lane.errors)
+                for name, lane in self.lanes.items()}
+
+
+# Shared by every controller module in the process
+bus = ActuatorBus()
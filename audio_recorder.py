@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import deque
+import numpy as np
+
+INT16_SCALE = 32767
+
+class AudioRecorder:
+    """Mono int16 recorder backed by a single preallocated numpy buffer.
+
+    The buffer is sized from the expected duration up front and only grows
+    (in whole chunks) when a session runs past it, so the audio callback
+    just scales each block straight into place without allocating.
+
+    Each block's (timestamp, end position) is appended to `blocks`, a bounded
+    deque used as a lock-free handoff to a BlockConsumer thread.
+    """
+
+    def __init__(self, sample_rate, duration, grow_sec=10.0, handoff_blocks=256):
+        self.sample_rate = sample_rate
+        self.grow_frames = max(int(grow_sec * sample_rate), 1)
+        self._buffer = np.empty(max(int(duration * sample_rate), 1), dtype=np.int16)
+        self.frames_written = 0
+        self.blocks = deque(maxlen=handoff_blocks)
+        self.total_blocks = 0
+        self.dropped_blocks = 0
+        self.overflowed_blocks = 0
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    @property
+    def audio(self):
+        """Zero-copy view of everything recorded so far"""
+        return self._buffer[:self.frames_written]
+
+    @property
+    def duration_secs(self):
+        return self.frames_written / self.sample_rate
+
+    def reset(self):
+        """Rewind to the start of the buffer, keeping the allocation"""
+        self.frames_written = 0
+        self.blocks.clear()
+        self.total_blocks = 0
+        self.dropped_blocks = 0
+        self.overflowed_blocks = 0
+
+    def callback(self, indata, frames, time_info, status):
+        """sounddevice InputStream callback: store the block and hand it off, nothing else"""
+        if status.input_overflow:
+            self.overflowed_blocks += 1
+        _, end = self.write(indata)
+        if len(self.blocks) == self.blocks.maxlen:
+            # Consumer fell behind; the oldest entry is evicted and its
+            # samples get folded into the next block it reads
+            self.dropped_blocks += 1
+        self.blocks.append((time.time(), end))
+        self.total_blocks += 1
+
+    def write(self, indata):
+        """Scale a float32 (frames, channels) block into the buffer (first channel only)"""
+        start = self.frames_written
+        end = start + len(indata)
+        if end > len(self._buffer):
+            self._grow(end)
+        # Same truncation as np.int16(audio * 32767), without the temporaries
+        np.multiply(indata[:, 0], INT16_SCALE, out=self._buffer[start:end], casting="unsafe")
+        self.frames_written = end
+        return start, end
+
+    def _grow(self, min_frames):
+        chunks = -(-(min_frames - len(self._buffer)) // self.grow_frames)
+        new_buffer = np.empty(len(self._buffer) + chunks * self.grow_frames, dtype=np.int16)
+        new_buffer[:self.frames_written] = self._buffer[:self.frames_written]
+        self._buffer = new_buffer
+
+
+class BlockConsumer:
+    """Drains an AudioRecorder's block handoff on its own thread.
+
+    Listeners are called as listener(block, timestamp) with an int16 view of
+    the samples recorded since the previous call, so per-block analysis never
+    runs on the audio driver thread. Samples behind a dropped handoff entry
+    are folded into the next block, so listeners still see every sample.
+    """
+
+    def __init__(self, recorder, listeners, poll_sec=0.01):
+        self.recorder = recorder
+        self.listeners = list(listeners)
+        self.poll_sec = poll_sec
+        self.consumed = 0
+        self.processed_blocks = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread, then process whatever the callback already handed off"""
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join()
+        self._drain()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if not self._drain():
+                self._stop_event.wait(self.poll_sec)
+
+    def _drain(self):
+        drained = False
+        while self.recorder.blocks:
+            timestamp, end = self.recorder.blocks.popleft()
+            self._dispatch(self.recorder.audio[self.consumed:end], timestamp)
+            self.consumed = max(self.consumed, end)
+            drained = True
+        return drained
+
+    def _dispatch(self, block, timestamp):
+        if not len(block):
+            return
+        self.processed_blocks += 1
+        for listener in self.listeners:
+            try:
+                listener(block, timestamp)
+            except Exception as e:
+                print(f"\n[AUDIO] Block listener error: {e}")
@@ -0,0 +1,132 @@
+import threading
+from collections import deque
+
+
+class CommandChannel:
+    """Bounded per-device command channel with latest-wins coalescing.
+
+    State-like commands (an LED style, a servo pose) only matter as the most
+    recent value, so a new one replaces any still-pending state command
+    instead of queueing behind it, and a command that matches what the
+    device is already doing (or is about to do) is dropped. Other commands
+    queue in order up to `maxlen`, after which the oldest is dropped.
+    Counters record every command that never reached the device and why.
+    """
+
+    def __init__(self, name, maxlen=8, applied=None):
+        """
+        Args:
+            name (str): Device name, used in reports
+            maxlen (int): Most commands held at once
+            applied (callable): Returns the state last confirmed by the device, if known
+        """
+        self.name = name
+        self.maxlen = maxlen
+        self.applied = applied
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._in_flight = None
+        self._last_sent = None
+        self.desired = None     # newest state command offered, whether or not it was sent
+        self.closed = False
+        self.submitted = 0
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.duplicates = 0
+        self.dropped = 0
+
+    def _expected_state(self):
+        if self._in_flight is not None:
+            return self._in_flight
+        if self.applied is not None:
+            return self.applied()
+        return self._last_sent
+
+    def put(self, command, state=True):
+        """
+        Offer a command to the device worker (never blocks)
+
+        Returns:
+            bool: False if it was dropped as a duplicate or the channel is closed
+        """
+        with self._cond:
+            if self.closed:
+                return False
+            self.submitted += 1
+            if state:
+                self.desired = command
+                stale = sum(1 for _, is_state in self._pending if is_state)
+                if stale:
+                    self._pending = deque(item for item in self._pending if not item[1])
+                    self.coalesced += stale
+                if command == self._expected_state():
+                    self.duplicates += 1
+                    return False
+            if len(self._pending) >= self.maxlen:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append((command, state))
+            self._cond.notify()
+            return True
+
+    def get(self, timeout=None):
+        """Next command for the worker, or None once closed (or on timeout)"""
+        item = self.get_item(timeout)
+        return item[0] if item is not None else None
+
+    def get_item(self, timeout=None):
+        """Like get(), but returns (command, state) so the worker can tell state commands apart"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending or self.closed, timeout):
+                return None
+            if not self._pending:
+                return None
+            command, state = self._pending.popleft()
+            if state:
+                self._in_flight = command
+            return command, state
+
+    def task_done(self, command, ok):
+        """Report the outcome of a command returned by get()"""
+        with self._cond:
+            if command == self._in_flight:
+                self._in_flight = None
+            if ok:
+                self.sent += 1
+                self._last_sent = command
+            else:
+                self.failed += 1
+                self._last_sent = None
+
+    def clear(self):
+        """Discard everything still pending"""
+        with self._cond:
+            self.dropped += len(self._pending)
+            self._pending.clear()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self.closed = False
+
+    def pending(self):
+        with self._cond:
+            return len(self._pending)
+
+    def stats(self):
+        with self._cond:
+            return {"submitted": self.submitted, "sent": self.sent, "failed": self.failed,
+                    "coalesced": self.coalesced, "duplicates": self.duplicates,
+                    "dropped": self.dropped, "pending": len(self._pending)}
+
+    def report(self):
+        stats = self.stats()
+        print(f"[{self.name.upper()}] Commands: {stats['submitted']} submitted | {stats['sent']} sent | "
+              f"{stats['coalesced']} coalesced | {stats['duplicates']} duplicates | "
+              f"{stats['dropped']} dropped | {stats['failed']} failed")
+        return stats
@@ -0,0 +1,176 @@
+import threading
+import time
+import requests
+
+PROBE_INTERVAL_SEC = 3.0       # while a board is healthy (a successful command counts as a probe)
+DOWN_PROBE_INTERVAL_SEC = 1.0  # while it is down, so recovery is noticed quickly
+BREAKER_FAILURE_THRESHOLD = 2  # consecutive failed requests before a board is treated as down
+BREAKER_COOLDOWN_SEC = 5.0     # open breakers let one trial request through after this long
+
+
+class DeviceUnavailable(requests.exceptions.ConnectionError):
+    """Raised instead of sending while a board's circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """Per-device breaker: closed (send), open (fail fast) or half-open (one trial).
+
+    Consecutive connection failures or timeouts open it; any success closes
+    it again. While open, requests are refused immediately instead of each
+    waiting out its own timeout, until either the health monitor sees the
+    board answer or the cooldown lets a single trial request through.
+    Callbacks in `on_close` run on the first success after any failure, so
+    senders can re-send state that was lost or refused in the meantime.
+    """
+
+    def __init__(self, name, failure_threshold=BREAKER_FAILURE_THRESHOLD, cooldown_sec=BREAKER_COOLDOWN_SEC):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.on_close = []
+
+    def allow(self):
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown_sec:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            recovered = self.state != "closed" or self.failures > 0
+            if self.state != "closed":
+                print(f"[HEALTH] {self.name} is back, resuming commands")
+            self.state = "closed"
+            self.failures = 0
+            self._trial_in_flight = False
+        if recovered:
+            for callback in list(self.on_close):
+                callback()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        if self.state != "open":
+            print(f"[HEALTH] {self.name} unreachable, failing fast until it answers again")
+        self.state = "open"
+        self.opened_at = time.monotonic()
+
+
+class HealthMonitor:
+    """Background prober that keeps a cached up/down state for every controller.
+
+    Each registered device gets its own daemon thread polling its /status,
+    slower while it is healthy and faster while it is down, so a board that
+    times out never delays another board's probe. Results feed the device's
+    circuit breaker like any other request, so a single slow reply from a
+    busy board doesn't mark it down. Successful commands count as probes.
+    Callers read the breaker state through is_available() instead of making
+    their own blocking connection tests.
+    """
+
+    def __init__(self, interval_sec=PROBE_INTERVAL_SEC, down_interval_sec=DOWN_PROBE_INTERVAL_SEC):
+        self.interval_sec = interval_sec
+        self.down_interval_sec = down_interval_sec
+        self.states = {}    # name -> {"up": bool, "checked_at": float, "rtt": float | None} (last answer)
+        self._threads = {}  # name -> its probe thread
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def probe(self, name):
+        """Probe one device now and update its cached state"""
+        from esp32_client import get_client
+        client = get_client(name)
+        start = time.perf_counter()
+        try:
+            # A board busy moving servos answers within its command timeout, not much sooner
+            up = client.status(timeout=client.timeout, probe=True).status_code == 200
+        except requests.exceptions.RequestException:
+            up = False
+        if up:
+            self.record_seen(name, time.perf_counter() - start)
+            client.breaker.record_success()
+        else:
+            self.states[name] = {"up": False, "checked_at": time.time(), "rtt": None}
+            client.breaker.record_failure()
+        return up
+
+    def record_seen(self, name, rtt):
+        """The board answered a request, so it needn't be probed for another interval"""
+        self.states[name] = {"up": True, "checked_at": time.time(), "rtt": rtt}
+
+    def start(self):
+        """Start probing every registered device in the background; later calls are free"""
+        from esp32_client import ESP32_DEVICES
+        self._stop.clear()
+        for name in list(ESP32_DEVICES):
+            self.watch(name)
+
+    def watch(self, name):
+        """Start the probe thread for one device, once"""
+        with self._lock:
+            thread = self._threads.get(name)
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._run, args=(name,), daemon=True, name=f"device-health-{name}")
+            self._threads[name] = thread
+        thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, name):
+        while not self._stop.is_set():
+            state = self.states.get(name)
+            if state is not None:
+                interval = self.interval_sec if state["up"] else self.down_interval_sec
+                # Commands that got an answer push checked_at forward, so this re-reads it after waiting
+                wait = state["checked_at"] + interval - time.time()
+                if wait > 0:
+                    self._stop.wait(wait)
+                    continue
+            self.probe(name)
+
+    def is_available(self, name):
+        """False while the board's breaker is open; never blocks
+
+        A board nobody has heard from yet counts as available: its probe thread
+        checks it right away, and commands open the breaker themselves if it
+        doesn't answer.
+        """
+        from esp32_client import get_client
+        self.watch(name)
+        return get_client(name).breaker.state != "open"
+
+    def report(self):
+        from esp32_client import get_client
+        for name, state in sorted(self.states.items()):
+            rtt = f"{state['rtt'] * 1000:.0f} ms" if state["rtt"] is not None else "-"
+            age = time.time() - state["checked_at"]
+            breaker = get_client(name).breaker
+            print(f"[HEALTH] {name:8s} {'DOWN' if breaker.state == 'open' else 'UP':4s} | breaker {breaker.state} "
+                  f"| last rtt {rtt} | checked {age:.1f}s ago")
+
+
+# Shared by every controller module in the process
+monitor = HealthMonitor()
+
+
+def is_available(name):
+    return monitor.is_available(name)
@@ -1,8 +1,10 @@
 import requests
 import time
+from esp32_client import get_client
+import device_health
 
-# ESP32 Configuration
-ESP32_IP = "192.168.213.5"
+# ESP32 Configuration (address comes from the esp32_client device registry)
+gesture_client = get_client("gesture")
 
 # Gesture mapping for backward compatibility
 GESTURE_MAPPING = {
@@ -28,10 +30,8 @@ def send_gesture(gesture_name, timeout=1):
     # Map gesture name if needed
     esp32_gesture = GESTURE_MAPPING.get(gesture_name, "relax")
     
-    url = f"http://{ESP32_IP}/preset?action={esp32_gesture}"
-    
     try:
-        response = requests.get(url, timeout=timeout)
+        response = gesture_client.preset(esp32_gesture, timeout=timeout)
         
         if response.status_code == 200:
             print(f"✅ Gesture '{esp32_gesture}' sent successfully to ESP32")
@@ -52,22 +52,16 @@ def send_gesture(gesture_name, timeout=1):
 
 def test_esp32_connection():
     """
-    Test ESP32 connectivity
+    Test ESP32 connectivity (cached state from the background health monitor)
     
     Returns:
         bool: True if ESP32 is reachable, False otherwise
     """
-    try:
-        response = requests.get(f"http://{ESP32_IP}/preset?action=relax", timeout=2)
-        if response.status_code == 200:
-            print(f"✅ ESP32 at {ESP32_IP} is reachable")
-            return True
-        else:
-            print(f"⚠️ ESP32 responded with status {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ ESP32 connection test failed: {e}")
-        return False
+    if device_health.is_available("gesture"):
+        print(f"✅ ESP32 at {gesture_client.host} is reachable")
+        return True
+    print(f"❌ ESP32 at {gesture_client.host} is not reachable")
+    return False
 
 def send_gesture_sequence(gestures, delay=1.0):
     """
@@ -109,5 +103,5 @@ if __name__ == "__main__":
         print("Please check:")
         print("1. ESP32 is powered on")
         print("2. ESP32 is connected to WiFi") 
-        print("3. IP address is correct:", ESP32_IP)
+        print("3. IP address is correct:", gesture_client.host)
         print("4. ESP32 web server is running")
\ No newline at end of file
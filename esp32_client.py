@@ -0,0 +1,201 @@
+import os
+import sys
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+import latency_stats
+from device_health import CircuitBreaker, DeviceUnavailable, monitor
+
+# ==== ESP32 Device Registry ====
+# One entry per controller board. Hosts can be overridden without editing code
+# through SPEAKZ_<NAME>_HOST, e.g. SPEAKZ_LED_HOST=192.168.1.40
+ESP32_DEVICES = {
+    "gesture": {"host": "192.168.213.5", "timeout": 1.0},
+    "led": {"host": "192.168.213.151", "timeout": 2.0},
+}
+
+CONNECT_TIMEOUT = 0.5   # seconds; a board on the LAN answers a SYN far faster
+POOL_SIZE = 4           # keep-alive sockets per board (the ESP32 web server handles few at once)
+
+
+def register_device(name, host, timeout=1.0):
+    """Add or replace a controller in the registry; drops any cached client for it"""
+    ESP32_DEVICES[name] = {"host": host, "timeout": timeout}
+    with _clients_lock:
+        client = _clients.pop(name, None)
+    if client is not None:
+        client.close()
+
+
+def device_host(name):
+    env_host = os.environ.get(f"SPEAKZ_{name.upper()}_HOST")
+    return env_host or ESP32_DEVICES[name]["host"]
+
+
+class ESP32Client:
+    """Pooled keep-alive HTTP client for one ESP32 controller.
+
+    All requests to the board share one requests.Session, so bursts of
+    gesture or LED commands reuse an open TCP connection instead of paying
+    a new handshake each time. Every request has a deadline: the connect
+    and read timeouts are both capped by whatever time is left, and no
+    retries are attempted past it.
+
+    `applied` remembers the last pose/style each endpoint confirmed, so
+    callers can skip re-sending the state the board is already in. It is
+    forgotten while a command is in flight or after one fails.
+
+    Every request's round trip, timeout or error is recorded in
+    latency_stats under (device name, endpoint). Requests go through the
+    device's circuit breaker and raise DeviceUnavailable (a
+    ConnectionError) without touching the network while the board is down;
+    health probes bypass it.
+    """
+
+    def __init__(self, name, host, timeout=1.0, pool_size=POOL_SIZE):
+        self.name = name
+        self.host = host
+        self.base_url = f"http://{host}"
+        self.timeout = timeout
+        self.applied = {}
+        self.breaker = CircuitBreaker(name)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+
+    def get(self, path, params=None, timeout=None, deadline=None, probe=False):
+        """
+        GET `path` on the board
+
+        Args:
+            path (str): Endpoint such as "/preset"
+            params (dict): Query parameters
+            timeout (float): Budget for this request, defaults to the device timeout
+            deadline (float): Absolute time.monotonic() by which the call must finish
+            probe (bool): Health check; sent even while the breaker is open
+
+        Returns:
+            requests.Response (raises requests.exceptions.Timeout if the deadline has passed)
+        """
+        return self._request("GET", path, timeout, deadline, probe, params=params)
+
+    def post_json(self, path, document, timeout=None, deadline=None):
+        """POST a JSON document to `path`; same timeout/deadline rules as get()"""
+        return self._request("POST", path, timeout, deadline, False, json=document)
+
+    def _request(self, method, path, timeout, deadline, probe, **kwargs):
+        if not probe and not self.breaker.allow():
+            raise DeviceUnavailable(f"{self.name} controller at {self.host} is down")
+        command = path.strip("/")
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + path,
+                                            timeout=self._timeouts(path, timeout, deadline), **kwargs)
+        except requests.exceptions.Timeout:
+            latency_stats.record_timeout(self.name, command)
+            if not probe:
+                self.breaker.record_failure()
+            raise
+        except requests.exceptions.RequestException:
+            latency_stats.record_error(self.name, command)
+            if not probe:
+                self.breaker.record_failure()
+            raise
+        elapsed = time.perf_counter() - start
+        latency_stats.record(self.name, command, elapsed, ok=response.status_code == 200)
+        if not probe:
+            # Any answer, even a busy/error status, means the board is reachable
+            monitor.record_seen(self.name, elapsed)
+            self.breaker.record_success()
+        return response
+
+    def _timeouts(self, path, timeout, deadline):
+        budget = self.timeout if timeout is None else timeout
+        if deadline is not None:
+            budget = min(budget, deadline - time.monotonic())
+            if budget <= 0:
+                raise requests.exceptions.Timeout(f"Deadline passed before sending {path} to {self.name}")
+        return min(CONNECT_TIMEOUT, budget), budget
+
+    def _set_state(self, path, key, value, **kwargs):
+        self.applied.pop(path, None)
+        response = self.get(path, params={key: value}, **kwargs)
+        if response.status_code == 200:
+            self.applied[path] = value
+        return response
+
+    def preset(self, action, **kwargs):
+        return self._set_state("/preset", "action", action, **kwargs)
+
+    def style(self, name, **kwargs):
+        return self._set_state("/style", "name", name, **kwargs)
+
+    def status(self, **kwargs):
+        return self.get("/status", **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(name):
+    """Shared client for a registered device, created on first use"""
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = ESP32Client(name, device_host(name), timeout=ESP32_DEVICES[name]["timeout"])
+            _clients[name] = client
+        return client
+
+
+def close_all():
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+def benchmark_keepalive(name="gesture", requests_count=50):
+    """Compare per-request connections with the pooled session against /status"""
+    client = get_client(name)
+    url = f"{client.base_url}/status"
+
+    def timed(send):
+        times = []
+        for _ in range(requests_count):
+            start = time.perf_counter()
+            try:
+                send()
+            except requests.exceptions.RequestException as e:
+                print(f"[ESP32] {name} request failed: {e}")
+                return None
+            times.append(time.perf_counter() - start)
+        times.sort()
+        return sum(times) / len(times), times[int(len(times) * 0.95) - 1]
+
+    print(f"[ESP32] {requests_count} x GET {url}")
+    cold = timed(lambda: requests.get(url, timeout=client.timeout))
+    warm = timed(lambda: client.status())
+    if cold is None or warm is None:
+        return
+    print(f"  new connection each: mean {cold[0] * 1000:.1f} ms | p95 {cold[1] * 1000:.1f} ms")
+    print(f"  pooled keep-alive:   mean {warm[0] * 1000:.1f} ms | p95 {warm[1] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        args = [arg for arg in sys.argv[1:] if arg != "--benchmark"]
+        benchmark_keepalive(args[0] if args else "gesture")
+    else:
+        for device in ESP32_DEVICES:
+            client = get_client(device)
+            try:
+                response = client.status()
+                print(f"[ESP32] {device} at {client.host}: status {response.status_code}")
+            except requests.exceptions.RequestException as e:
+                print(f"[ESP32] {device} at {client.host}: unreachable ({e})")
@@ -0,0 +1,263 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from colorama import Fore, init
+
+init(autoreset=True)
+
+
+class SimulatedBoard:
+    """State of one stand-in ESP32: current pose/style and everything it executed.
+
+    Impairments model what the real boards do on a busy WiFi network:
+    `latency_ms` +/- `jitter_ms` before each reply, a `loss` fraction of
+    requests that never get an answer (the connection stalls, then drops),
+    and servo moves that take `servo_move_ms`. Like the Arduino WebServer,
+    requests are handled one at a time unless `single_threaded` is off, and
+    a /preset that arrives mid-move either waits for the servos or, with
+    `busy_status` set (e.g. 503), is refused.
+    """
+
+    def __init__(self, name, latency_ms=0.0, jitter_ms=0.0, loss=0.0, servo_move_ms=0.0,
+                 busy_status=None, single_threaded=True, loss_stall_sec=3.0, verbose=True, seed=None):
+        self.name = name
+        self.pose = "relax"
+        self.style = "off"
+        self.executed = []      # (time.time(), kind, value, source)
+        self.requests = 0
+        self.lost = 0
+        self.busy_rejections = 0
+        self.timeline = None
+        self.timeline_run = None
+        self.lock = threading.Lock()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.loss = loss
+        self.servo_move_ms = servo_move_ms
+        self.busy_status = busy_status
+        self.loss_stall_sec = loss_stall_sec
+        self.verbose = verbose
+        self.servo_free_at = 0.0
+        self.handler_lock = threading.Lock() if single_threaded else None
+        self.random = random.Random(seed)
+
+    def network_delay(self):
+        if self.latency_ms or self.jitter_ms:
+            time.sleep(max(self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms), 0) / 1000)
+
+    def is_lost(self):
+        return self.loss > 0 and self.random.random() < self.loss
+
+    def servo_wait(self):
+        """Seconds until the servos finish their current move"""
+        return max(self.servo_free_at - time.time(), 0.0)
+
+    def start_move(self):
+        self.servo_free_at = time.time() + self.servo_move_ms / 1000
+
+    def execute(self, kind, value, source="request"):
+        with self.lock:
+            if kind == "preset":
+                self.pose = value
+            else:
+                self.style = value
+            self.executed.append((time.time(), kind, value, source))
+        if self.verbose:
+            print(Fore.MAGENTA + f"[SIM {self.name}] {kind} -> {value} ({source})")
+
+    def load_timeline(self, document):
+        with self.lock:
+            self.cancel_timeline()
+            self.timeline = {"id": document["id"],
+                             "events": {event["id"]: dict(event) for event in document["events"]}}
+
+    def retime(self, document):
+        with self.lock:
+            if self.timeline is None or self.timeline["id"] != document["id"]:
+                return False
+            for event in document["events"]:
+                if event["id"] in self.timeline["events"]:
+                    self.timeline["events"][event["id"]].update(offset_ms=event["offset_ms"], armed=True)
+            if self.timeline_run is not None:
+                self.timeline_run["changed"].set()
+            return True
+
+    def start_timeline(self, timeline_id, delay_ms):
+        with self.lock:
+            if self.timeline is None or self.timeline["id"] != timeline_id:
+                return False
+            self.cancel_timeline()
+            run = {"start": time.time() + delay_ms / 1000, "done": set(),
+                   "changed": threading.Event(), "cancelled": False}
+            self.timeline_run = run
+        threading.Thread(target=self._run_timeline, args=(run,), daemon=True).start()
+        return True
+
+    def cancel_timeline(self):
+        if self.timeline_run is not None:
+            self.timeline_run["cancelled"] = True
+            self.timeline_run["changed"].set()
+            self.timeline_run = None
+
+    def _run_timeline(self, run):
+        # Like the firmware loop: always run the earliest not-yet-executed event on the board clock
+        while not run["cancelled"]:
+            with self.lock:
+                remaining = [event for event_id, event in self.timeline["events"].items()
+                             if event_id not in run["done"]]
+            if not remaining:
+                return
+            # Held (unarmed) events wait for a retime; they never run on their estimate
+            armed = [event for event in remaining if event.get("armed", True)]
+            if not armed:
+                run["changed"].wait()
+                run["changed"].clear()
+                continue
+            event = min(armed, key=lambda e: e["offset_ms"])
+            wait = run["start"] + event["offset_ms"] / 1000 - time.time()
+            if wait > 0:
+                run["changed"].wait(wait)
+                run["changed"].clear()
+                continue
+            run["done"].add(event["id"])
+            self.start_move()
+            self.execute("preset", event["action"], source=f"timeline@{event['offset_ms']}ms")
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the ESP32 WebServer with pooled clients
+
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        # Single write so headers and body leave in one segment
+        self.wfile.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                         f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+                         .encode("ascii") + payload)
+
+    def _impaired(self, handle):
+        board = self.server.board
+        board.requests += 1
+        if board.is_lost():
+            # Lost on the air: the client hears nothing and eventually gives up
+            board.lost += 1
+            time.sleep(board.loss_stall_sec)
+            self.close_connection = True
+            return
+        board.network_delay()
+        if board.handler_lock is None:
+            handle(board)
+        else:
+            with board.handler_lock:
+                handle(board)
+
+    def do_GET(self):
+        self._impaired(self._handle_get)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._document = json.loads(self.rfile.read(length) or b"{}")
+        self._impaired(self._handle_post)
+
+    def _handle_get(self, board):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/status":
+            self._reply(200, {"pose": board.pose, "style": board.style})
+        elif url.path == "/preset" and "action" in query:
+            wait = board.servo_wait()
+            if wait and board.busy_status:
+                board.busy_rejections += 1
+                self._reply(board.busy_status, {"error": "servos busy", "retry_ms": int(wait * 1000)})
+                return
+            time.sleep(wait)
+            board.start_move()
+            board.execute("preset", query["action"])
+            self._reply(200, {"pose": board.pose})
+        elif url.path == "/style" and "name" in query:
+            board.execute("style", query["name"])
+            self._reply(200, {"style": board.style})
+        elif url.path == "/timeline/start":
+            ok = board.start_timeline(query.get("id"), int(query.get("delay_ms", 0)))
+            self._reply(200 if ok else 409, {"started": ok})
+        elif url.path == "/timeline/cancel":
+            with board.lock:
+                board.cancel_timeline()
+            self._reply(200, {"cancelled": True})
+        else:
+            self._reply(404, {"error": "unknown endpoint"})
+
+    def _handle_post(self, board):
+        document = self._document
+        if self.path == "/timeline":
+            board.load_timeline(document)
+            self._reply(200, {"id": document["id"], "events": len(document["events"])})
+        elif self.path == "/timeline/retime":
+            ok = board.retime(document)
+            self._reply(200 if ok else 409, {"retimed": ok})
+        else:
+            self._reply(404, {"error": "unknown endpoint"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ESP32Simulator:
+    """Local stand-in for one ESP32 controller, served on 127.0.0.1:<port>"""
+
+    def __init__(self, name="gesture", port=0, host="127.0.0.1", **impairments):
+        self.board = SimulatedBoard(name, **impairments)
+        self.server = ThreadingHTTPServer((host, port), SimulatorHandler)
+        self.server.daemon_threads = True
+        self.server.board = self.board
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address
+        return f"{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"[SIM] {self.board.name} controller listening on {self.address}")
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def add_impairment_args(parser):
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean extra reply delay")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- spread around the latency")
+    parser.add_argument("--loss", type=float, default=0.0, help="Fraction of requests that never get a reply")
+    parser.add_argument("--servo-move-ms", type=float, default=0.0, help="How long each pose change keeps the servos busy")
+    parser.add_argument("--busy-status", type=int, default=None,
+                        help="Refuse presets mid-move with this status instead of waiting (e.g. 503)")
+
+
+def impairments_from_args(args):
+    return {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "loss": args.loss,
+            "servo_move_ms": args.servo_move_ms, "busy_status": args.busy_status}
+
+
+if __name__ == "__main__":
+    # then e.g. SPEAKZ_GESTURE_HOST=127.0.0.1:8081 SPEAKZ_LED_HOST=127.0.0.1:8082 python main_controller.py
+    parser = argparse.ArgumentParser(description="Stand-in ESP32 gesture and LED controllers")
+    parser.add_argument("--gesture-port", type=int, default=8081)
+    parser.add_argument("--led-port", type=int, default=8082)
+    add_impairment_args(parser)
+    args = parser.parse_args()
+    impairments = impairments_from_args(args)
+    simulators = [ESP32Simulator("gesture", args.gesture_port, **impairments).start(),
+                  ESP32Simulator("led", args.led_port, **dict(impairments, servo_move_ms=0.0)).start()]
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for simulator in simulators:
+            simulator.stop()
@@ -1,7 +1,5 @@
 import os
 import datetime
-from google import genai
-from google.genai import types
 from colorama import Fore, init
 from dotenv import load_dotenv
 
@@ -21,6 +19,10 @@ def optimize_presentation_script(transcript: str) -> str:
         print(Fore.RED + "GENAI_API_KEY not found in .env file.")
         return ""
 
+    # google.genai takes most of a second to import; only pay for it when optimizing
+    from google import genai
+    from google.genai import types
+
     # Authenticate Gemini client
     client = genai.Client(api_key=api_key)
 
@@ -8,7 +8,7 @@ gesture_keywords = {
     "solution": "hands_away",
     "conclusion": "relax",
     "relax": "relax",
-    "Good morning ": "hands_away ",
+    "Good morning": "hands_away",
     "Good evening" : "hands_away",
     "Good afternoon":"hands_away",
     "I'm Speakz" :"relax",
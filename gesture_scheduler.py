@@ -0,0 +1,103 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class GestureScheduler:
+    """Fires timeline events at their offsets from a shared start time.
+
+    Events live in a heap keyed by (time, sequence number), so entries with
+    the same timestamp never collide, and the worker sleeps on a condition
+    until the earliest one is due instead of polling the whole timeline.
+    Scheduling a new event or cancelling wakes it early. Every firing records
+    its lateness: how long after its due time it actually went out.
+    """
+
+    def __init__(self, fire, lead_sec=0.0):
+        """
+        Args:
+            fire (callable): Called with the event dict when it is due
+            lead_sec (float): Fire this much ahead of each event's time
+        """
+        self.fire = fire
+        self.lead_sec = lead_sec
+        self.fired = []
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._start_time = None
+        self._closed = False
+        self._cancelled = False
+        self._thread = None
+
+    def schedule(self, event):
+        """Add an event dict with at least a "time" offset in seconds"""
+        with self._condition:
+            heapq.heappush(self._heap, (event["time"], next(self._sequence), event))
+            self._condition.notify()
+
+    def start(self, start_time=None):
+        """Start the clock (time.time() by default) and the worker thread"""
+        with self._condition:
+            self._start_time = time.time() if start_time is None else start_time
+            self._condition.notify()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """No more events will be scheduled; the worker exits once the heap is empty"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def cancel(self):
+        """Drop every pending event and stop the worker"""
+        with self._condition:
+            self._cancelled = True
+            self._heap.clear()
+            self._condition.notify()
+
+    def join(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def pending(self):
+        return len(self._heap)
+
+    def _next_due_event(self):
+        """Block until the earliest event is due; returns (event, due_time) or None to exit"""
+        with self._condition:
+            while not self._cancelled:
+                if self._heap and self._start_time is not None:
+                    due = self._start_time + max(self._heap[0][0] - self.lead_sec, 0.0)
+                    wait = due - time.time()
+                    if wait <= 0:
+                        return heapq.heappop(self._heap)[2], due
+                    self._condition.wait(wait)
+                elif self._closed and not self._heap:
+                    return None
+                else:
+                    self._condition.wait()
+            return None
+
+    def _run(self):
+        while True:
+            next_event = self._next_due_event()
+            if next_event is None:
+                break
+            event, due = next_event
+            self.fired.append((event, time.time() - due))
+            try:
+                self.fire(event)
+            except Exception as e:
+                print(f"[SCHEDULER] Error firing event at {event['time']:.1f}s: {e}")
+
+    def lateness_summary(self):
+        """(fired count, mean lateness, max lateness) in seconds"""
+        if not self.fired:
+            return 0, 0.0, 0.0
+        lateness = [late for _, late in self.fired]
+        return len(lateness), sum(lateness) / len(lateness), max(lateness)
@@ -1,72 +1,56 @@
 import requests
 import time
 import threading
-from queue import Queue
+from esp32_client import get_client
+from command_channel import CommandChannel
+from actuator_bus import bus
+import device_health
 
-ESP32_IP = "192.168.213.5"  # Make sure this IP is correct for your ESP32
+# Board address lives in the esp32_client device registry ("gesture")
+gesture_client = get_client("gesture")
 
 # Threading control
-gesture_queue = Queue()
-gesture_thread = None
-stop_gesture_thread = False
-
-def _gesture_worker():
-    """Background thread worker for sending gestures"""
-    global stop_gesture_thread
-    
-    while not stop_gesture_thread:
-        try:
-            # Get gesture from queue with timeout
-            gesture = gesture_queue.get(timeout=0.1)
-            
-            if gesture == "STOP":
-                break
-                
-            # Send gesture immediately
-            _send_gesture_direct(gesture)
-            gesture_queue.task_done()
-            
-        except:
-            # Queue empty or timeout - continue loop
-            continue
+# Poses are state: only the newest pending one is sent, and re-sending the current pose is skipped
+gesture_queue = CommandChannel("gesture", applied=lambda: gesture_client.applied.get("/preset"))
+gesture_lane = None
 
 def _send_gesture_direct(gesture: str):
     """Direct gesture sending without threading (internal use)"""
     try:
-        url = f"http://{ESP32_IP}/preset?action={gesture}"
-        response = requests.get(url, timeout=1)  # Reduced timeout for speed
+        response = gesture_client.preset(gesture)
         
         if response.status_code == 200:
             print(f"[GESTURE] Sent: {gesture}")
+            return True
         else:
             print(f"[ERROR] Failed to send gesture. Status: {response.status_code}")
     except requests.exceptions.Timeout:
         print(f"[ERROR] Timeout when sending gesture: {gesture}")
     except requests.exceptions.ConnectionError:
-        print(f"[ERROR] Cannot connect to ESP32 at {ESP32_IP}")
+        print(f"[ERROR] Cannot connect to ESP32 at {gesture_client.host}")
     except Exception as e:
         print(f"[ERROR] Exception when sending gesture: {e}")
+    return False
 
 def start_gesture_system():
-    """Initialize the real-time gesture system"""
-    global gesture_thread, stop_gesture_thread
-    
-    if gesture_thread is None or not gesture_thread.is_alive():
-        stop_gesture_thread = False
-        gesture_thread = threading.Thread(target=_gesture_worker, daemon=True)
-        gesture_thread.start()
+    """Initialize the real-time gesture system (a lane on the shared actuator bus)"""
+    global gesture_lane
+    
+    gesture_queue.reopen()
+    if gesture_lane is None:
+        # Bus timeout sits just past the client's own so the HTTP deadline normally fires first
+        gesture_lane = bus.register("gesture", gesture_queue, _send_gesture_direct,
+                                    timeout=gesture_client.timeout + 0.5)
+        # Poses refused while the board was down are re-sent once it answers again
+        gesture_client.breaker.on_close.append(lambda: bus.resync("gesture"))
         print("[GESTURE] Real-time gesture system started")
 
 def stop_gesture_system():
     """Stop the gesture system"""
-    global stop_gesture_thread
-    
-    stop_gesture_thread = True
-    gesture_queue.put("STOP")  # Signal thread to stop
-    
-    if gesture_thread and gesture_thread.is_alive():
-        gesture_thread.join(timeout=1)
+    bus.flush("gesture", timeout=1)
+    gesture_queue.close()  # Later sends are refused until the system is restarted
     
+    gesture_queue.report()
     print("[GESTURE] Gesture system stopped")
 
 def send_gesture(gesture: str):
@@ -74,12 +58,11 @@ def send_gesture(gesture: str):
     # Start system if not running
     start_gesture_system()
     
-    # Add gesture to queue for immediate processing
-    try:
-        gesture_queue.put_nowait(gesture)
+    # Replaces any gesture still waiting; skipped if the robot is already in that pose
+    if bus.submit("gesture", gesture):
         print(f"[GESTURE] Queued: {gesture}")
-    except:
-        print(f"[GESTURE] Queue full, skipping: {gesture}")
+    else:
+        print(f"[GESTURE] Already in pose, skipping: {gesture}")
 
 def send_gesture_blocking(gesture: str):
     """Send gesture and wait for completion (blocking)"""
@@ -101,18 +84,12 @@ def send_gesture_sequence(gestures: list, delays: list = None):
     sequence_thread.start()
 
 def test_connection():
-    """Test if ESP32 is reachable"""
-    try:
-        response = requests.get(f"http://{ESP32_IP}/status", timeout=2)
-        if response.status_code == 200:
-            print("[GESTURE] ESP32 connection OK")
-            return True
-        else:
-            print("[GESTURE] ESP32 responded but with error")
-            return False
-    except:
-        print(f"[GESTURE] Cannot reach ESP32 at {ESP32_IP}")
-        return False
+    """Test if ESP32 is reachable (cached state from the background health monitor)"""
+    if device_health.is_available("gesture"):
+        print("[GESTURE] ESP32 connection OK")
+        return True
+    print(f"[GESTURE] Cannot reach ESP32 at {gesture_client.host}")
+    return False
 
 def test_gestures():
     """Test all available gestures"""
@@ -148,9 +125,6 @@ def test_gesture_sequence():
     send_gesture_sequence(welcome_gestures, welcome_delays)
     print("Gesture sequence started in background!")
 
-# Auto-start the gesture system when imported
-start_gesture_system()
-
 if __name__ == "__main__":
     print("=== Real-time Gesture System Test ===")
     
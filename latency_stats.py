@@ -0,0 +1,113 @@
+import bisect
+import json
+import threading
+from colorama import Fore, init
+
+init(autoreset=True)
+
+# Log-spaced bucket upper bounds: 0.5 ms to ~20 s, each 25% wider than the last
+BUCKET_BOUNDS = [0.0005 * 1.25 ** i for i in range(48)]
+
+
+class LatencyHistogram:
+    """Fixed-bucket round-trip histogram with timeout and error counts.
+
+    Recording is O(log buckets) and memory is constant however many
+    commands are sent. Percentiles are read back as the upper bound of the
+    bucket they fall in (at most 25% high), capped at the largest sample.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.samples = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+        self.errors = 0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.samples += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, fraction):
+        if not self.samples:
+            return 0.0
+        rank = fraction * self.samples
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS[index] if index < len(BUCKET_BOUNDS) else self.max
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        mean = self.total / self.samples if self.samples else 0.0
+        return {"count": self.samples, "mean_ms": mean * 1000,
+                "p50_ms": self.percentile(0.50) * 1000, "p95_ms": self.percentile(0.95) * 1000,
+                "p99_ms": self.percentile(0.99) * 1000, "max_ms": self.max * 1000,
+                "timeouts": self.timeouts, "errors": self.errors}
+
+
+_histograms = {}
+_lock = threading.Lock()
+
+
+def _histogram(device, command):
+    key = (device, command)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        histogram = _histograms.setdefault(key, LatencyHistogram())
+    return histogram
+
+
+def record(device, command, seconds, ok=True):
+    """Record one completed round trip; ok=False counts it as an error too (e.g. non-200)"""
+    with _lock:
+        histogram = _histogram(device, command)
+        histogram.record(seconds)
+        if not ok:
+            histogram.errors += 1
+
+
+def record_timeout(device, command):
+    with _lock:
+        _histogram(device, command).timeouts += 1
+
+
+def record_error(device, command):
+    with _lock:
+        _histogram(device, command).errors += 1
+
+
+def summary(device=None, command=None):
+    """Current stats as {(device, command): {...}}, optionally filtered; safe to call any time"""
+    with _lock:
+        return {key: histogram.summary() for key, histogram in sorted(_histograms.items())
+                if (device is None or key[0] == device) and (command is None or key[1] == command)}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def report(path=None, budget_ms=100):
+    """Print every device/command row (red if over the p99 budget or failing) and optionally save as JSON"""
+    stats = summary()
+    if not stats:
+        print("[LATENCY] No controller commands recorded")
+        return stats
+    print("[LATENCY] device/command            count   p50 ms   p95 ms   p99 ms   max ms  timeouts  errors")
+    for (device, command), row in stats.items():
+        color = Fore.RED if row["p99_ms"] > budget_ms or row["timeouts"] or row["errors"] else Fore.GREEN
+        print(color + f"  {device + '/' + command:30s}{row['count']:6d}{row['p50_ms']:9.1f}{row['p95_ms']:9.1f}"
+                      f"{row['p99_ms']:9.1f}{row['max_ms']:9.1f}{row['timeouts']:10d}{row['errors']:8d}")
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([dict(device=device, command=command, **row) for (device, command), row in stats.items()],
+                      f, indent=2)
+        print(f"[LATENCY] Saved to {path}")
+    return stats
@@ -0,0 +1,31 @@
+import importlib
+
+
+class LazyModule:
+    """Stands in for a heavy module and imports it on first attribute access.
+
+    `speechsdk = lazy_module("azure.cognitiveservices.speech")` keeps every
+    `speechsdk.X` call site unchanged while moving the import cost to the
+    first code path that actually uses it. importlib's per-module locks make
+    concurrent first use from the warm-up and main threads safe.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name):
+    return LazyModule(name)
@@ -1,36 +1,24 @@
 import requests
 import time
-import threading
-from queue import Queue
 from colorama import Fore, init
+from esp32_client import get_client
+from command_channel import CommandChannel
+from actuator_bus import bus
+import device_health
 
 init(autoreset=True)
 
-ESP32_IP = "192.168.213.151"  # Change this to your ESP32 IP
-BASE_URL = f"http://{ESP32_IP}"
-
-led_queue = Queue()
-led_thread = None
-stop_led_thread = False
-
-def _led_worker():
-    """Background thread to process LED pattern commands from queue"""
-    global stop_led_thread
-    while not stop_led_thread:
-        try:
-            pattern = led_queue.get(timeout=0.1)
-            if pattern == "STOP":
-                break
-            _send_led_command_direct(pattern)
-            led_queue.task_done()
-        except:
-            continue
+# Board address lives in the esp32_client device registry ("led")
+led_client = get_client("led")
+
+# A style is state: bursts collapse to the newest pattern and repeats of the current one are skipped
+led_queue = CommandChannel("led", applied=lambda: led_client.applied.get("/style"))
+led_lane = None
 
 def _send_led_command_direct(pattern: str):
     """Send LED pattern command as simple GET request"""
     try:
-        url = f"{BASE_URL}/style?name={pattern}"
-        response = requests.get(url, timeout=2)
+        response = led_client.style(pattern)
         if response.status_code == 200:
             print(f"[LED] Sent pattern: {pattern}")
             return True
@@ -42,49 +30,39 @@ def _send_led_command_direct(pattern: str):
         return False
 
 def start_led_system():
-    """Start the background LED command thread"""
-    global led_thread, stop_led_thread
-    if led_thread is None or not led_thread.is_alive():
-        stop_led_thread = False
-        led_thread = threading.Thread(target=_led_worker, daemon=True)
-        led_thread.start()
+    """Attach the LED controller to the shared actuator bus"""
+    global led_lane
+    led_queue.reopen()
+    if led_lane is None:
+        led_lane = bus.register("led", led_queue, _send_led_command_direct, timeout=led_client.timeout + 0.5)
+        # Patterns refused while the board was down are re-sent once it answers again
+        led_client.breaker.on_close.append(lambda: bus.resync("led"))
         print("[LED] LED system started")
 
 def stop_led_system():
-    """Stop LED command thread cleanly"""
-    global stop_led_thread
-    stop_led_thread = True
-    led_queue.put("STOP")
-    if led_thread and led_thread.is_alive():
-        led_thread.join(timeout=1)
+    """Send what is already queued, then refuse new patterns"""
+    bus.flush("led", timeout=1)
+    led_queue.close()
+    led_queue.report()
     print("[LED] LED system stopped")
 
 def send_led_pattern(pattern: str):
     """Send LED pattern asynchronously (non-blocking)"""
     start_led_system()
-    try:
-        led_queue.put_nowait(pattern)
+    if bus.submit("led", pattern):
         print(f"[LED] Queued pattern: {pattern}")
-    except:
-        print("[LED] Queue full, skipping pattern")
 
 def send_led_pattern_blocking(pattern: str):
     """Send LED pattern synchronously (blocking)"""
     return _send_led_command_direct(pattern)
 
 def test_connection():
-    """Check if ESP32 is reachable"""
-    try:
-        response = requests.get(f"{BASE_URL}/status", timeout=2)
-        if response.status_code == 200:
-            print(Fore.GREEN + "[LED] ESP32 connection OK")
-            return True
-        else:
-            print(Fore.RED + "[LED] ESP32 responded with error")
-            return False
-    except:
-        print(Fore.RED + "[LED] Cannot reach ESP32. Check IP and connection.")
-        return False
+    """Check if ESP32 is reachable (cached state from the background health monitor)"""
+    if device_health.is_available("led"):
+        print(Fore.GREEN + "[LED] ESP32 connection OK")
+        return True
+    print(Fore.RED + "[LED] Cannot reach ESP32. Check IP and connection.")
+    return False
 
 # Convenient pattern functions
 def start_startup_pattern():
@@ -116,13 +94,11 @@ def led_off():
   
 def stop_all_patterns():
     """Stop the LED command thread and turn off LEDs immediately."""
-    global stop_led_thread
     # Turn off LEDs first
     _send_led_command_direct("off")
     # Stop the LED system so no more patterns run
-    stop_led_thread = True
-    led_queue.queue.clear()  # clear any pending patterns
-    led_queue.put("STOP")    # signal thread to exit
+    led_queue.clear()  # clear any pending patterns
+    led_queue.close()  # refuse new patterns until restarted
 
 
 
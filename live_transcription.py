@@ -1,20 +1,27 @@
 import sys
-import sounddevice as sd
 import numpy as np
-import scipy.io.wavfile as wav
 import time
 import os
 import datetime
+import threading
 from colorama import Fore, init
-import speech_recognition as sr
+from lazy_import import lazy_module
+from audio_recorder import AudioRecorder, BlockConsumer, INT16_SCALE
+from phrase_matcher import PhraseMatcher, count_matches
+from streaming_transcriber import StreamingTranscriber, GoogleRecognizerBackend, OfflineRecognizerBackend, prepare_audio_data
 from gemini_optimize import optimize_presentation_script
 from speakz_greeting import speak_text, speak_with_gesture
+import latency_stats
 from led_controller import led_good, led_too_loud, led_too_soft, led_long_pause, led_off, test_connection, start_processing_pattern
 import random
-import pygame
 
 init(autoreset=True)
 
+# Loaded on first use: only the recording and transcription paths pay for them
+sd = lazy_module("sounddevice")
+wav = lazy_module("scipy.io.wavfile")
+sr = lazy_module("speech_recognition")
+
 # ===== CONFIG =====
 duration = 40
 sample_rate = 44100
@@ -23,7 +30,12 @@ threshold_db_good_max = 80
 threshold_db_soft = 55
 threshold_db_loud = 85
 pause_threshold_sec = 1.0
+pause_frame_sec = 0.05
 realtime_pause_threshold = 2.0
+end_of_speech_stop = True         # Stop early once the speaker goes quiet; `duration` is the cap
+end_of_speech_silence_sec = 3.0
+trim_padding_sec = 0.25
+streaming_transcription = True    # Recognize pause-delimited segments while still recording
 CHIME_AUDIO_FILE = "waiting.mp3"  # Reuses main_controller.py chime
 
 filler_words = {
@@ -35,6 +47,7 @@ filler_words = {
     "you see", "you get me", "you feel me",
     "anyway", "stuff like that", "things like that"
 }
+FILLER_MATCHER = PhraseMatcher(filler_words)
 
 # Feedback message variations
 VOLUME_GOOD = [
@@ -107,14 +120,59 @@ ACTIONABLE_TIPS = [
 # Global variables for real-time analysis
 led_connected = False
 silence_start_time = None
-audio_buffer = []
+recorder = None
+audio_metrics = None
+live_transcriber = None
 last_led_time = 0
 led_cooldown_sec = 0.1
 last_led_state = None
+status_refresh_sec = 0.2
+last_status_time = 0
 
 def amplitude_to_db(amplitude):
     return 20 * np.log10(np.abs(amplitude) + 1e-10) + 90
 
+def db_to_amplitude(db):
+    """Inverse of amplitude_to_db: linear amplitude that maps to `db`"""
+    return 10 ** ((db - 90) / 20) - 1e-10
+
+def silent_sample_mask(audio_data, full_scale=1.0):
+    """Boolean mask of samples below threshold_db_soft.
+
+    Compares against the linear amplitude threshold once instead of running
+    amplitude_to_db (a log10) over every sample. Pass full_scale=INT16_SCALE
+    to test int16 samples without converting them to float first.
+    """
+    return np.abs(audio_data) < db_to_amplitude(threshold_db_soft) * full_scale
+
+def detect_pauses(silent_samples, frame_size, min_pause_sec=pause_threshold_sec):
+    """Find pauses in a per-sample silence mask in a single vectorized pass.
+
+    Samples are grouped into frames of `frame_size` (the last frame may be
+    partial), a frame is silent when all of its samples are, and runs of
+    silent frames lasting at least `min_pause_sec` count as pauses.
+
+    Returns:
+        tuple: (pauses, pause_durations) with durations in seconds
+    """
+    n_samples = len(silent_samples)
+    if n_samples == 0:
+        return 0, []
+
+    full_frames = n_samples // frame_size
+    frame_silent = silent_samples[:full_frames * frame_size].reshape(full_frames, frame_size).all(axis=1)
+    if n_samples % frame_size:
+        frame_silent = np.append(frame_silent, silent_samples[full_frames * frame_size:].all())
+
+    # Run-length encode silent frames: +1 marks a run start, -1 a run end
+    edges = np.diff(np.concatenate(([0], frame_silent.astype(np.int8), [0])))
+    run_starts = np.flatnonzero(edges == 1) * frame_size
+    run_ends = np.minimum(np.flatnonzero(edges == -1) * frame_size, n_samples)
+
+    run_secs = (run_ends - run_starts) / sample_rate
+    pause_durations = run_secs[run_secs >= min_pause_sec].tolist()
+    return len(pause_durations), pause_durations
+
 def check_led_connection():
     global led_connected
     led_connected = test_connection()
@@ -154,19 +212,14 @@ End of Session Report
         print(Fore.YELLOW + f"⚠️ Warning: Could not save user transcript copy: {e}")
         return None
 
-def update_led_realtime(chunk):
+def update_led_realtime(volume, now):
     global silence_start_time, led_connected, last_led_time, last_led_state
 
     if not led_connected:
         return
 
-    if chunk.dtype == np.int16 or chunk.dtype == np.int32:
-        chunk = chunk.astype(np.float32) / 32767
-
-    volume = amplitude_to_db(np.abs(chunk).mean())
     is_silence = volume < threshold_db_soft
 
-    now = time.time()
     if now - last_led_time < led_cooldown_sec:
         return
 
@@ -205,16 +258,25 @@ def update_led_realtime(chunk):
         except Exception as e:
             print(f"\n[LED ERROR] {e}")
 
-def audio_callback(indata, frames, time, status):
-    global audio_buffer
-    if status:
-        print(f'Audio callback error: {status}')
-    audio_buffer.append(indata.copy())
-    chunk = indata.flatten()
-    update_led_realtime(chunk)
-    volume = amplitude_to_db(np.abs(chunk).mean())
+def render_status(volume, now):
+    """Redraw the recording status line, at most once per status_refresh_sec"""
+    global last_status_time
+    if now - last_status_time < status_refresh_sec:
+        return
+    last_status_time = now
     print(f"\r{Fore.CYAN}🎤 Recording... Vol: {volume:.1f} dB   ", end="", flush=True)
 
+def realtime_feedback(block, timestamp):
+    """BlockConsumer listener: drives the LEDs and status line off the audio thread"""
+    volume = amplitude_to_db(np.abs(block).mean() / INT16_SCALE)
+    update_led_realtime(volume, timestamp)
+    render_status(volume, timestamp)
+
+def report_block_stats(recorder, consumer):
+    dropped, overflowed = recorder.dropped_blocks, recorder.overflowed_blocks
+    color = Fore.YELLOW if dropped or overflowed else Fore.WHITE
+    print(color + f"📊 Audio blocks: {consumer.processed_blocks} processed | {dropped} dropped | {overflowed} overflowed")
+
 def simulate_led(color, message):
     color_map = {
         "green": Fore.GREEN,
@@ -234,6 +296,7 @@ def blink_led(color, times=3):
 
 def play_feedback_chime():
     try:
+        import pygame
         pygame.mixer.init()
         pygame.mixer.music.load(CHIME_AUDIO_FILE)
         pygame.mixer.music.play()
@@ -242,20 +305,45 @@ def play_feedback_chime():
     except Exception as e:
         print(f"[WARNING] Could not play feedback chime: {e}")
 
-def transcribe_audio(filename, max_retries=3):
+def finish_streaming_transcript():
+    """Collect the transcript built during recording; None means fall back to transcribe_audio"""
+    if live_transcriber is None:
+        return None
+    text = live_transcriber.finish()
+    if text:
+        print(Fore.WHITE + f"\n🗣️ Transcription: {text}")
+    else:
+        print(Fore.YELLOW + "[INFO] Streaming transcript unavailable, transcribing full recording...")
+    return text
+
+def transcribe_audio(filename, max_retries=3, audio=None):
+    """Transcribe the recording; pass `audio` (int16 samples) to skip reading `filename` back"""
     recognizer = sr.Recognizer()
     retries = 0
+
+    # Decode, resample and encode once; every retry reuses the same payload
+    decode_start = time.perf_counter()
+    if audio is None:
+        with sr.AudioFile(filename) as source:
+            file_audio = recognizer.record(source)
+        audio = np.frombuffer(file_audio.get_raw_data(convert_width=2), dtype=np.int16)
+        audio_rate = file_audio.sample_rate
+    else:
+        audio_rate = sample_rate
+    audio_data = prepare_audio_data(audio, audio_rate)
+    decode_secs = time.perf_counter() - decode_start
     
     while retries < max_retries:
-        with sr.AudioFile(filename) as source:
-            audio_data = recognizer.record(source)
+        recognize_start = time.perf_counter()
         try:
             text = recognizer.recognize_google(audio_data)
             print(Fore.WHITE + f"\n🗣️ Transcription: {text}")
+            print(Fore.WHITE + f"⏱️ Audio prep: {decode_secs:.2f}s | Recognition: {time.perf_counter() - recognize_start:.2f}s")
             return text.lower()
         except sr.UnknownValueError:
             retries += 1
-            print(Fore.YELLOW + f"[WARNING] Speech unintelligible. {max_retries - retries} retries left.")
+            print(Fore.YELLOW + f"[WARNING] Speech unintelligible. {max_retries - retries} retries left. "
+                                f"(recognition took {time.perf_counter() - recognize_start:.2f}s)")
             if retries < max_retries:
                 speak_with_gesture(random.choice([
                     "My ears are on strike! Try speaking clearly one more time!",
@@ -269,12 +357,18 @@ def transcribe_audio(filename, max_retries=3):
     print(Fore.YELLOW + "[INFO] Max retries reached. Please type your transcript.")
     return input("Type your transcript: ").lower()
 
-def record_audio(filename="recording.wav"):
-    global audio_buffer, led_connected, silence_start_time, last_led_time, last_led_state
-    audio_buffer = []
+def record_audio(filename="recording.wav", stop_on_silence=None, transcriber_backend=None):
+    """Record until end of speech (or `duration`); stop_on_silence=None follows end_of_speech_stop"""
+    global recorder, audio_metrics, live_transcriber, led_connected, silence_start_time, last_led_time, last_led_state, last_status_time
+    if stop_on_silence is None:
+        # Read at call time, so changing the module setting takes effect
+        stop_on_silence = end_of_speech_stop
+    recorder = AudioRecorder(sample_rate, duration)
+    audio_metrics = AudioMetricsAccumulator()
     silence_start_time = None
     last_led_time = 0
     last_led_state = None
+    last_status_time = 0
     
     check_led_connection()
     print(Fore.CYAN + "🎤 Recording started with real-time LED feedback...")
@@ -285,38 +379,78 @@ def record_audio(filename="recording.wav"):
     
     simulate_led("blue", "Listening...")
     
+    end_of_speech = EndOfSpeechDetector()
+    listeners = [realtime_feedback, audio_metrics.update]
+    if stop_on_silence:
+        listeners.append(end_of_speech.update)
+        print(Fore.WHITE + f"Recording stops after {end_of_speech_silence_sec:.0f}s of silence (max {duration}s)")
+    live_transcriber = None
+    if streaming_transcription or transcriber_backend is not None:
+        live_transcriber = StreamingTranscriber(recorder, transcriber_backend or GoogleRecognizerBackend(),
+                                                db_to_amplitude(threshold_db_soft) * INT16_SCALE)
+        listeners.append(live_transcriber.update)
+    consumer = BlockConsumer(recorder, listeners)
+    consumer.start()
+    recorded = False
     try:
         with sd.InputStream(samplerate=sample_rate, channels=1, 
-                          callback=audio_callback, dtype='float32'):
-            sd.sleep(int(duration * 1000))
+                          callback=recorder.callback, dtype='float32'):
+            if stop_on_silence:
+                end_of_speech.done.wait(duration)
+            else:
+                sd.sleep(int(duration * 1000))
+        recorded = True
     except Exception as e:
         print(f"\n{Fore.RED}Recording error: {e}")
+    finally:
+        consumer.stop()
+        if not recorded and live_transcriber is not None:
+            # Nobody will call finish() for a failed recording, so end its worker here
+            live_transcriber.stop()
+            live_transcriber = None
+    if not recorded:
         return None, None
     
     if led_connected:
         led_off()
     
     print(f"\n{Fore.CYAN}✅ Recording complete!")
+    report_block_stats(recorder, consumer)
     
-    if audio_buffer:
-        audio = np.concatenate(audio_buffer, axis=0).flatten()
-        audio_int16 = np.int16(audio * 32767)
+    if recorder.frames_written:
+        start, end = audio_metrics.trim()
+        audio_int16 = recorder.audio[start:end]
+        if end - start < recorder.frames_written:
+            print(Fore.WHITE + f"✂️ Trimmed {(recorder.frames_written - (end - start)) / sample_rate:.1f}s of leading/trailing silence")
         wav.write(filename, sample_rate, audio_int16)
         print(Fore.CYAN + "💾 Recording saved.")
-        return filename, audio_int16.flatten()
+        return filename, audio_int16
     else:
         print(Fore.RED + "❌ No audio recorded!")
         return None, None
 
-def analyze_audio(audio_data):
-    if audio_data.dtype == np.int16 or audio_data.dtype == np.int32:
-        audio_data = audio_data.astype(np.float32) / 32767
+def analyze_audio(audio_data, frame_sec=pause_frame_sec):
+    # Integer recordings are measured in place rather than copied to float
+    full_scale = INT16_SCALE if audio_data.dtype == np.int16 or audio_data.dtype == np.int32 else 1.0
 
-    volume = amplitude_to_db(np.abs(audio_data).mean())
-    duration_secs = len(audio_data) / sample_rate
-    silence_ratio = np.sum(amplitude_to_db(np.abs(audio_data)) < threshold_db_soft) / len(audio_data)
+    silent = silent_sample_mask(audio_data, full_scale)
+    frame_size = max(int(sample_rate * frame_sec), 1)
+    pauses, pause_durations = detect_pauses(silent, frame_size)
 
-    print(Fore.WHITE + f"\n🔍 Duration: {duration_secs:.2f} sec | Avg Volume: {volume:.1f} dB | Silence: {silence_ratio:.2%}")
+    return report_audio_metrics({
+        "volume": amplitude_to_db(np.abs(audio_data).mean() / full_scale),
+        "duration_secs": len(audio_data) / sample_rate,
+        "silence_ratio": np.count_nonzero(silent) / len(audio_data),
+        "pauses": pauses,
+        "pause_durations": pause_durations,
+    })
+
+def report_audio_metrics(metrics):
+    """Print and LED-signal audio metrics; returns (pauses, pause_durations) like analyze_audio"""
+    volume = metrics["volume"]
+    pauses = metrics["pauses"]
+
+    print(Fore.WHITE + f"\n🔍 Duration: {metrics['duration_secs']:.2f} sec | Avg Volume: {volume:.1f} dB | Silence: {metrics['silence_ratio']:.2%}")
 
     if volume > threshold_db_loud:
         simulate_led("red", "⚠️ Too loud!")
@@ -325,15 +459,159 @@ def analyze_audio(audio_data):
     else:
         simulate_led("green", "✅ Volume is good")
 
-    frame_size = int(sample_rate * 0.05)
+    if pauses > 5:
+        blink_led("yellow", times=3)
+        print(Fore.YELLOW + f"⚠️ Too many pauses detected: {pauses}")
+    elif pauses > 0:
+        simulate_led("yellow", f"🙂 Pauses: {pauses}")
+    else:
+        simulate_led("green", "👍 No significant pauses")
+
+    return pauses, metrics["pause_durations"]
+
+class AudioMetricsAccumulator:
+    """Builds analyze_audio's metrics block by block while recording.
+
+    Blocks are cut into the same frames analyze_audio uses, carrying partial
+    frames across block boundaries, and a pause state machine tracks runs of
+    silent frames. When the stream closes, result() matches analyze_audio on
+    the full recording without another pass over the samples.
+    """
+
+    def __init__(self, frame_sec=pause_frame_sec, full_scale=INT16_SCALE):
+        self.frame_size = max(int(sample_rate * frame_sec), 1)
+        self.full_scale = full_scale
+        self.silence_level = db_to_amplitude(threshold_db_soft) * full_scale
+        self.total_samples = 0
+        self.abs_sum = 0
+        self.silent_samples = 0
+        self.frame_fill = 0
+        self.frame_silent = True
+        self.frame_abs = 0.0
+        self.frame_abs_sums = []
+        self.first_voiced = None
+        self.last_voiced = None
+        self.pause_start = None
+        self.pause_runs = []
+        self.window = None
+
+    def update(self, block, timestamp=None):
+        """Feed the next block of samples (BlockConsumer listener signature)"""
+        magnitude = np.abs(block)
+        self.abs_sum += magnitude.sum(dtype=np.float64)
+        silent = magnitude < self.silence_level
+        self.silent_samples += int(np.count_nonzero(silent))
+
+        pos = 0
+        while pos < len(block):
+            take = min(self.frame_size - self.frame_fill, len(block) - pos)
+            self.frame_silent = self.frame_silent and bool(silent[pos:pos + take].all())
+            self.frame_abs += magnitude[pos:pos + take].sum(dtype=np.float64)
+            self.frame_fill += take
+            pos += take
+            if self.frame_fill == self.frame_size:
+                frame_start = self.total_samples + pos - self.frame_size
+                if not self.frame_silent:
+                    if self.first_voiced is None:
+                        self.first_voiced = frame_start
+                    self.last_voiced = frame_start + self.frame_size
+                self.pause_start = self._close_frame(frame_start, self.frame_silent,
+                                                     self.pause_start, self.pause_runs)
+                self.frame_abs_sums.append(self.frame_abs)
+                self.frame_fill = 0
+                self.frame_silent = True
+                self.frame_abs = 0.0
+        self.total_samples += len(block)
+
+    def _close_frame(self, frame_start, frame_silent, pause_start, pause_runs):
+        """Advance the pause state machine by one frame; returns the new pause_start"""
+        if frame_silent:
+            return frame_start if pause_start is None else pause_start
+        if pause_start is not None and (frame_start - pause_start) / sample_rate >= pause_threshold_sec:
+            pause_runs.append((pause_start, frame_start))
+        return None
+
+    def trim(self, padding_sec=trim_padding_sec):
+        """Restrict result() to the voiced span plus padding; returns (start, end) samples.
+
+        Bounds fall on frame boundaries, so everything cut away is whole
+        silent frames and the metrics can be corrected without the audio.
+        """
+        first_voiced, last_voiced = self.first_voiced, self.last_voiced
+        if self.frame_fill and not self.frame_silent:
+            first_voiced = self.total_samples - self.frame_fill if first_voiced is None else first_voiced
+            last_voiced = self.total_samples
+        if first_voiced is None:
+            self.window = None
+            return 0, self.total_samples
+
+        padding = int(round(padding_sec / (self.frame_size / sample_rate))) * self.frame_size
+        self.window = (max(first_voiced - padding, 0), min(last_voiced + padding, self.total_samples))
+        return self.window
+
+    def result(self):
+        """analyze_audio-compatible metrics for everything fed so far (or the trimmed window)"""
+        if not self.total_samples:
+            return None
+
+        # Close the trailing partial frame and any open pause on copies, so
+        # recording can keep going after a peek
+        pause_runs = list(self.pause_runs)
+        pause_start = self.pause_start
+        if self.frame_fill:
+            pause_start = self._close_frame(self.total_samples - self.frame_fill,
+                                            self.frame_silent, pause_start, pause_runs)
+        if pause_start is not None and (self.total_samples - pause_start) / sample_rate >= pause_threshold_sec:
+            pause_runs.append((pause_start, self.total_samples))
+
+        start, end = self.window or (0, self.total_samples)
+        samples = end - start
+        # Trimmed samples are all silent; take their amplitude off per frame
+        frame_sums = self.frame_abs_sums + ([self.frame_abs] if self.frame_fill else [])
+        trimmed_abs = sum(frame_sums[:start // self.frame_size]) + sum(frame_sums[end // self.frame_size:] if end < self.total_samples else [])
+        pause_durations = [(min(e, end) - max(s, start)) / sample_rate for s, e in pause_runs]
+        pause_durations = [d for d in pause_durations if d >= pause_threshold_sec]
+        return {
+            "volume": amplitude_to_db((self.abs_sum - trimmed_abs) / samples / self.full_scale),
+            "duration_secs": samples / sample_rate,
+            "silence_ratio": (self.silent_samples - (self.total_samples - samples)) / samples,
+            "pauses": len(pause_durations),
+            "pause_durations": pause_durations,
+        }
+
+class EndOfSpeechDetector:
+    """BlockConsumer listener that flags the end of a speech.
+
+    Uses the same block-level rule as the real-time LEDs (block volume below
+    threshold_db_soft is silence) and sets `done` once `silence_sec` of
+    silence follows speech. Silence before the first word never triggers it.
+    """
+
+    def __init__(self, silence_sec=end_of_speech_silence_sec, full_scale=INT16_SCALE):
+        self.silence_samples_needed = int(silence_sec * sample_rate)
+        self.full_scale = full_scale
+        self.heard_speech = False
+        self.silence_samples = 0
+        self.done = threading.Event()
+
+    def update(self, block, timestamp=None):
+        volume = amplitude_to_db(np.abs(block).mean() / self.full_scale)
+        if volume >= threshold_db_soft:
+            self.heard_speech = True
+            self.silence_samples = 0
+        elif self.heard_speech:
+            self.silence_samples += len(block)
+            if self.silence_samples >= self.silence_samples_needed:
+                self.done.set()
+
+def _detect_pauses_framewise(audio_data, frame_size):
+    """Original frame-by-frame pause loop, kept as the benchmark baseline"""
     silent_frames = amplitude_to_db(np.abs(audio_data)) < threshold_db_soft
     pauses = 0
     pause_durations = []
-
     start_pause = None
     for i in range(0, len(audio_data), frame_size):
-        frame = silent_frames[i:i+frame_size]
-        if np.all(frame):
+        if np.all(silent_frames[i:i+frame_size]):
             if start_pause is None:
                 start_pause = i
         else:
@@ -348,26 +626,83 @@ def analyze_audio(audio_data):
         if pause_length_sec >= pause_threshold_sec:
             pauses += 1
             pause_durations.append(pause_length_sec)
-
-    if pauses > 5:
-        blink_led("yellow", times=3)
-        print(Fore.YELLOW + f"⚠️ Too many pauses detected: {pauses}")
-    elif pauses > 0:
-        simulate_led("yellow", f"🙂 Pauses: {pauses}")
-    else:
-        simulate_led("green", "👍 No significant pauses")
-
     return pauses, pause_durations
 
-def analyze_transcript(text, duration_secs, pauses):
+def benchmark_pause_detection(minutes=5, repeats=3, frame_sec=pause_frame_sec):
+    """Time vectorized vs frame-loop pause detection on a synthetic rehearsal"""
+    rng = np.random.default_rng(0)
+    n_samples = int(minutes * 60 * sample_rate)
+    audio = (rng.standard_normal(n_samples) * 0.1).astype(np.float32)
+    # Carve out silences of 0.2 - 3 s roughly every 4 s of speech
+    pos = 0
+    while pos < n_samples:
+        pos += int(rng.uniform(2, 6) * sample_rate)
+        gap = int(rng.uniform(0.2, 3.0) * sample_rate)
+        audio[pos:pos + gap] *= 0.001
+        pos += gap
+    frame_size = max(int(sample_rate * frame_sec), 1)
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - t0)
+        return best, result
+
+    loop_time, loop_result = best_of(lambda: _detect_pauses_framewise(audio, frame_size))
+    vec_time, vec_result = best_of(lambda: detect_pauses(silent_sample_mask(audio), frame_size))
+
+    print(Fore.CYAN + f"⏱️ Pause detection on {minutes} min @ {sample_rate} Hz ({frame_sec * 1000:.0f} ms frames)")
+    print(Fore.WHITE + f"   Frame loop: {loop_time * 1000:8.1f} ms | pauses: {loop_result[0]}")
+    print(Fore.WHITE + f"   Vectorized: {vec_time * 1000:8.1f} ms | pauses: {vec_result[0]}")
+    print(Fore.WHITE + f"   Speedup:    {loop_time / vec_time:8.1f}x")
+    if loop_result[0] != vec_result[0] or not np.allclose(loop_result[1], vec_result[1]):
+        print(Fore.RED + "❌ Vectorized result differs from frame loop!")
+    return loop_time, vec_time
+
+def benchmark_filler_matching(total_words=20000, repeats=3):
+    """Time the compiled filler matcher against per-filler words.count on a long transcript"""
+    rng = np.random.default_rng(0)
+    vocabulary = ["the", "speech", "today", "we", "talk", "about", "our", "island", "people", "and", "culture"]
+    phrases = vocabulary * 4 + sorted(filler_words)
+    chosen = rng.choice(len(phrases), size=total_words)
+    text = " ".join(phrases[i] for i in chosen)
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - t0)
+        return best, result
+
+    def count_per_filler():
+        words = text.split()
+        return {fw: words.count(fw) for fw in filler_words if fw in words}
+
+    count_time, old_counts = best_of(count_per_filler)
+    matcher_time, new_counts = best_of(lambda: FILLER_MATCHER.count_all(text))
+    positions_time, matches = best_of(lambda: FILLER_MATCHER.find_all(text))
+
+    print(Fore.CYAN + f"⏱️ Filler detection on {len(text.split())} words ({len(filler_words)} fillers)")
+    print(Fore.WHITE + f"   words.count per filler: {count_time * 1000:8.1f} ms | fillers: {sum(old_counts.values())} (single words only)")
+    print(Fore.WHITE + f"   Compiled matcher:       {matcher_time * 1000:8.1f} ms | fillers: {sum(new_counts.values())} (incl. multi-word)")
+    print(Fore.WHITE + f"   With token positions:   {positions_time * 1000:8.1f} ms | matches: {len(matches)}")
+    print(Fore.WHITE + f"   Speedup (counts):       {count_time / matcher_time:8.1f}x")
+    return count_time, matcher_time
+
+def analyze_transcript(text, duration_secs, pauses, word_times=None):
+    """Filler and speed analysis; `word_times` adds (start, end) seconds to each filler match"""
     if not text:
         print(Fore.RED + "No transcript to analyze.")
         return None
 
     words = text.split()
     total_words = len(words)
-    filler_count_map = {fw: words.count(fw) for fw in filler_words if fw in words}
-    total_filler_count = sum(filler_count_map.values())
+    filler_matches = FILLER_MATCHER.find_all(text, word_times)
+    filler_count_map = count_matches(filler_matches)
+    total_filler_count = len(filler_matches)
 
     effective_time = max(duration_secs - pauses * pause_threshold_sec, 0.1)
     speech_speed_wpm = (total_words / effective_time) * 60
@@ -394,6 +729,7 @@ def analyze_transcript(text, duration_secs, pauses):
 
     return {
         "filler_count_map": filler_count_map,
+        "filler_matches": filler_matches,
         "total_filler_count": total_filler_count,
         "total_words": total_words,
         "speech_speed_wpm": speech_speed_wpm
@@ -465,19 +801,35 @@ def generate_feedback_summary(volume, pauses, pause_durations, filler_count_map,
     
     return feedback_lines
 
-if __name__ == "__main__":
+def run_practice_session():
+    """
+    Record one practice run, give spoken feedback and optimize the script
+
+    Callable in-process by a long-lived controller; the text files are still
+    written as a record, but everything is also returned.
+
+    Returns:
+        dict: transcript, metrics, feedback_lines and optimized_script (None where unavailable)
+    """
     print(Fore.CYAN + "🤖 Starting Speech Analysis with LED Feedback System")
     print(Fore.WHITE + "=" * 60)
     
+    result = {"transcript": None, "metrics": None, "feedback_lines": [], "optimized_script": None}
     filename, audio = record_audio()
     
     if filename and audio is not None:
-        pauses, pause_durations = analyze_audio(audio)
-        transcript = transcribe_audio(filename)
-        transcript_analysis = analyze_transcript(transcript, duration, pauses)
+        # Metrics were accumulated during recording; no second pass needed
+        audio_summary = audio_metrics.result()
+        pauses, pause_durations = report_audio_metrics(audio_summary)
+        transcript = finish_streaming_transcript()
+        # Segment-level timing from the streaming transcriber; the fallback transcription has none
+        word_times = live_transcriber.word_times() if transcript else None
+        transcript = transcript or transcribe_audio(filename, audio=audio)
+        transcript_analysis = analyze_transcript(transcript, audio_summary["duration_secs"], pauses, word_times)
+        result["transcript"] = transcript
 
         if transcript and transcript_analysis:
-            volume = amplitude_to_db(np.abs(audio).mean())
+            volume = audio_summary["volume"]
             feedback_lines = generate_feedback_summary(
                 volume=volume,
                 pauses=pauses,
@@ -487,6 +839,10 @@ if __name__ == "__main__":
                 total_words=transcript_analysis["total_words"],
                 speech_speed_wpm=transcript_analysis["speech_speed_wpm"]
             )
+            result["feedback_lines"] = feedback_lines
+            result["metrics"] = {"volume": volume, "pauses": pauses,
+                                 "speech_speed_wpm": transcript_analysis["speech_speed_wpm"],
+                                 "filler_count": transcript_analysis["total_filler_count"]}
 
             # Save feedback metrics to feedback.txt
             with open("feedback.txt", "w", encoding="utf-8") as f:
@@ -520,6 +876,7 @@ if __name__ == "__main__":
             optimized_script = optimize_presentation_script(transcript)
 
             if optimized_script.strip():
+                result["optimized_script"] = optimized_script
                 print(Fore.CYAN + "\n📝 Optimized Script:\n")
                 print(optimized_script)
                 with open("optimized_output.txt", "w", encoding="utf-8") as f:
@@ -540,4 +897,66 @@ if __name__ == "__main__":
         print(Fore.RED + "❌ Recording failed or no audio data.")
     
     print(Fore.WHITE + "\n" + "=" * 60)
-    print(Fore.CYAN + "🎯 Session Complete!")
\ No newline at end of file
+    print(Fore.CYAN + "🎯 Session Complete!")
+    return result
+
+def transcribe_wav_offline(filename, phrases, block_sec=0.1):
+    """
+    Feed a WAV file through StreamingTranscriber with OfflineRecognizerBackend
+
+    No microphone, network or LEDs: the recording is cut into segments exactly
+    as it would be live, each segment is "recognized" as the next scripted
+    phrase, and the transcript gets the usual filler analysis with word times.
+
+    Returns:
+        dict: analyze_transcript's result, or None if no segment was found
+    """
+    rate, samples = wav.read(filename)
+    if samples.ndim > 1:
+        samples = samples[:, 0]
+    # AudioRecorder.write takes float32 blocks in [-1, 1], like the sounddevice callback
+    full_scale = 2 ** (8 * samples.itemsize - 1)
+    if samples.dtype.kind == "i":
+        samples = samples / full_scale
+    elif samples.dtype.kind == "u":
+        samples = (samples.astype(np.float32) - full_scale) / full_scale
+    samples = samples.astype(np.float32).reshape(-1, 1)
+
+    offline_recorder = AudioRecorder(rate, len(samples) / rate)
+    backend = OfflineRecognizerBackend(phrases)
+    transcriber = StreamingTranscriber(offline_recorder, backend, db_to_amplitude(threshold_db_soft) * INT16_SCALE)
+    block = max(int(rate * block_sec), 1)
+    for offset in range(0, len(samples), block):
+        start, end = offline_recorder.write(samples[offset:offset + block])
+        transcriber.update(offline_recorder.audio[start:end])
+    transcript = transcriber.finish()
+
+    print(Fore.CYAN + f"🎧 {filename}: {offline_recorder.duration_secs:.1f}s cut into {len(backend.segments)} segments "
+                      f"({', '.join(f'{secs:.1f}s' for secs in backend.segments)})")
+    if not transcript:
+        print(Fore.RED + "❌ No speech segments found.")
+        return None
+    print(Fore.WHITE + f"🗣️ Transcription: {transcript}")
+    silent = silent_sample_mask(offline_recorder.audio, INT16_SCALE)
+    pauses, _ = detect_pauses(silent, max(int(rate * pause_frame_sec), 1))
+    analysis = analyze_transcript(transcript, offline_recorder.duration_secs, pauses, transcriber.word_times())
+    for match in analysis["filler_matches"]:
+        when = f"{match.time[0]:.1f}-{match.time[1]:.1f}s" if match.time else "untimed"
+        print(Fore.WHITE + f"   '{match.phrase}' word {match.start} at {when}")
+    return analysis
+
+if __name__ == "__main__":
+    if "--benchmark-pauses" in sys.argv:
+        benchmark_pause_detection()
+        sys.exit(0)
+    if "--benchmark-fillers" in sys.argv:
+        benchmark_filler_matching()
+        sys.exit(0)
+    if "--offline-wav" in sys.argv:
+        # --offline-wav FILE [PHRASE ...]: one scripted phrase per detected segment
+        index = sys.argv.index("--offline-wav")
+        transcribe_wav_offline(sys.argv[index + 1], sys.argv[index + 2:])
+        sys.exit(0)
+
+    run_practice_session()
+    latency_stats.report()
@@ -0,0 +1,140 @@
+import argparse
+import random
+import threading
+import time
+from colorama import Fore, init
+import esp32_client
+import device_health
+import latency_stats
+from esp32_simulator import ESP32Simulator, add_impairment_args, impairments_from_args
+
+init(autoreset=True)
+
+LED_STATES = ["good", "too_loud", "too_soft", "long_pause"]
+GESTURES = ["handsup", "handsdown", "handtogether", "handaway", "relax", "point"]
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def led_burst_driver(stop, submissions, rng, block_sec=0.05):
+    """Like update_led_realtime: a volume verdict per audio block, mostly repeating the last one"""
+    import led_controller
+    patterns = {"good": led_controller.led_good, "too_loud": led_controller.led_too_loud,
+                "too_soft": led_controller.led_too_soft, "long_pause": led_controller.led_long_pause}
+    values = {"good": "green", "too_loud": "red", "too_soft": "orange", "long_pause": "red"}
+    state = "good"
+    while not stop.is_set():
+        if rng.random() < 0.15:
+            state = rng.choice(LED_STATES)
+        submissions.append((time.time(), "led", values[state]))
+        patterns[state]()
+        time.sleep(block_sec)
+
+
+def gesture_burst_driver(stop, submissions, rng):
+    """A gesture every second or two while speaking, plus rapid-fire bursts on emphatic sentences"""
+    import gesture_sender
+    while not stop.is_set():
+        burst = rng.randint(4, 7) if rng.random() < 0.3 else 1
+        for _ in range(burst):
+            gesture = rng.choice(GESTURES)
+            submissions.append((time.time(), "gesture", gesture))
+            gesture_sender.send_gesture(gesture)
+            time.sleep(rng.uniform(0.03, 0.1))
+        stop.wait(rng.uniform(0.8, 2.0))
+
+
+def staleness(board, device, submissions):
+    """Submit-to-execute delay for every command the board executed"""
+    submitted = [(ts, value) for ts, dev, value in submissions if dev == device]
+    delays = []
+    for executed_at, _, value, source in board.executed:
+        if source != "request":
+            continue
+        latest = [ts for ts, v in submitted if v == value and ts <= executed_at]
+        if latest:
+            delays.append(executed_at - latest[-1])
+    return delays
+
+
+def last_submitted(submissions, device):
+    return next((value for _, dev, value in reversed(submissions) if dev == device), None)
+
+
+def board_state(device, board):
+    return board.pose if device == "gesture" else board.style
+
+
+def wait_for_final_state(boards, submissions, timeout):
+    """Give lost or refused commands time to be re-sent once each board answers again"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(board_state(name, board) == last_submitted(submissions, name) for name, board in boards):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def run_load_test(duration=10.0, seed=1, settle=10.0, **impairments):
+    rng = random.Random(seed)
+    gesture_sim = ESP32Simulator("gesture", verbose=False, seed=seed, **impairments).start()
+    led_sim = ESP32Simulator("led", verbose=False, seed=seed + 1, **dict(impairments, servo_move_ms=0.0)).start()
+    # Point the registry at the simulators before the sender modules create their clients
+    esp32_client.register_device("gesture", gesture_sim.address, timeout=1.0)
+    esp32_client.register_device("led", led_sim.address, timeout=2.0)
+    import gesture_sender
+    import led_controller
+    latency_stats.reset()
+    device_health.monitor.start()
+
+    submissions = []
+    stop = threading.Event()
+    drivers = [threading.Thread(target=led_burst_driver, args=(stop, submissions, random.Random(rng.random()))),
+               threading.Thread(target=gesture_burst_driver, args=(stop, submissions, random.Random(rng.random())))]
+    print(Fore.CYAN + f"[LOAD] Driving gesture + LED traffic for {duration:.0f}s with {impairments}")
+    start = time.time()
+    for driver in drivers:
+        driver.start()
+    time.sleep(duration)
+    stop.set()
+    for driver in drivers:
+        driver.join()
+    settle_start = time.time()
+    settled = wait_for_final_state([("gesture", gesture_sim.board), ("led", led_sim.board)], submissions, settle)
+    print(Fore.CYAN + f"[LOAD] Final states {'settled' if settled else 'still stale'} "
+                      f"{time.time() - settle_start:.1f}s after traffic stopped")
+    gesture_sender.stop_gesture_system()
+    led_controller.stop_led_system()
+    elapsed = time.time() - start
+
+    print(Fore.CYAN + f"\n[LOAD] Results over {elapsed:.1f}s")
+    for name, simulator, channel in (("gesture", gesture_sim, gesture_sender.gesture_queue),
+                                     ("led", led_sim, led_controller.led_queue)):
+        board = simulator.board
+        stats = channel.stats()
+        delays = staleness(board, name, submissions)
+        final_state = board_state(name, board)
+        print(f"  {name:8s} submitted {stats['submitted']:5d} | sent {stats['sent']:4d} "
+              f"({stats['sent'] / elapsed:.1f}/s) | coalesced {stats['coalesced']} | duplicates {stats['duplicates']} "
+              f"| failed {stats['failed']} | lost {board.lost} | busy {board.busy_rejections}")
+        print(f"  {'':8s} submit->executed p50 {percentile(delays, 0.5) * 1000:.0f} ms | "
+              f"p95 {percentile(delays, 0.95) * 1000:.0f} ms | p99 {percentile(delays, 0.99) * 1000:.0f} ms | "
+              f"final state {'matches' if final_state == last_submitted(submissions, name) else 'STALE'} ({final_state})")
+    latency_stats.report()
+    gesture_sim.stop()
+    led_sim.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive realistic gesture/LED bursts through the real senders")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--settle", type=float, default=10.0, help="Seconds to wait for final states after traffic stops")
+    add_impairment_args(parser)
+    args = parser.parse_args()
+    run_load_test(args.duration, args.seed, args.settle, **impairments_from_args(args))
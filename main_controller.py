@@ -1,10 +1,13 @@
-import os
 import threading
-import pygame
-import subprocess
-import sys
 import time
-from speakz_greeting import speak_text, recognize_speech, speak_greeting, update_practice_log, ask_practice
+from speakz_greeting import (
+    speak_text, recognize_speech, speak_greeting, update_practice_log, ask_practice,
+    warm_up_speech, report_tts_cache, WARMUP_PHRASES, get_speech_config, get_speech_session
+)
+from wake_word import WakeWordListener
+from orchestrator import orchestrator
+import latency_stats
+import device_health
 from gesture_sender import send_gesture
 from led_controller import (
     start_startup_pattern, start_listening_pattern,
@@ -13,12 +16,25 @@ from led_controller import (
 )
 
 CHIME_AUDIO_FILE = "sound.mp3"
+LATENCY_REPORT_FILE = "actuator_latency.json"  # Per-controller RTT percentiles, written at goodbye
 QUOTE = "The way to get started is to quit talking and begin doing."
 
+# Controller prompts, pre-synthesized alongside the greeting phrases
+CONTROLLER_PHRASES = [
+    QUOTE,
+    "Would you like me to present the optimized speech now? Please say yes or no.",
+    "Okay, I'll wait. Just say 'Okay, do the presentation' or 'Goodbye'.",
+    "I didn't catch that. Please say yes or no.",
+    "I'm listening. Say 'Okay, do the presentation' or 'Goodbye'.",
+    "Goodbye! Speakz is going to sleep.",
+    "Sorry, there was an error with the presentation.",
+]
+
 # ------------------- STARTUP FUNCTIONS -------------------
 
 def play_chime():
     """Play the chime audio and return when it finishes"""
+    import pygame
     pygame.mixer.init()
     pygame.mixer.music.load(CHIME_AUDIO_FILE)
     pygame.mixer.music.play()
@@ -47,9 +63,19 @@ def speak_motivational_quote():
     """Speak the motivational quote"""
     speak_text(QUOTE)
 
+# ------------------- PRESENTATION -------------------
+
+def present_script(script):
+    """Deliver the optimized script in-process with the warm presentation speaker"""
+    try:
+        orchestrator.present(script)
+    except Exception as e:
+        print(f"[ERROR] Presentation failed: {e}")
+        speak_text("Sorry, there was an error with the presentation.")
+
 # ------------------- WAIT FOR DECISION -------------------
 
-def wait_for_user_decision(temp_file, led_connected):
+def wait_for_user_decision(script, led_connected):
     while True:
         if led_connected:
             start_listening_pattern()
@@ -61,11 +87,7 @@ def wait_for_user_decision(temp_file, led_connected):
                 if led_connected:
                     start_speaking_pattern()
                 send_gesture("handsup")
-                try:
-                    subprocess.run([sys.executable, "speakz_optimized.py", temp_file])
-                except subprocess.CalledProcessError as e:
-                    print(f"[ERROR] Could not run speakz_optimized.py: {e}")
-                    speak_text("Sorry, there was an error with the presentation.")
+                present_script(script)
                 send_gesture("relax")
                 break
             elif "goodbye" in lower or "bye" in lower:
@@ -85,7 +107,14 @@ def wait_for_user_decision(temp_file, led_connected):
 
 # ------------------- MAIN CONTROL -------------------
 
-def main():
+def main(warmed_up=False):
+    """Run one session; warmed_up=True when a standby worker (touch_server) already warmed up"""
+    if not warmed_up:
+        # Open speech connections and fill the TTS cache while the LED check and chime run
+        threading.Thread(target=warm_up_speech, args=(CONTROLLER_PHRASES + WARMUP_PHRASES,), daemon=True).start()
+        # Import the practice and presentation stages now so no cycle pays for them
+        threading.Thread(target=orchestrator.preload, daemon=True).start()
+
     print("Testing LED connection...")
     led_connected = test_connection()
     
@@ -104,16 +133,18 @@ def main():
     
     send_gesture("relax")
     print("🎤 Ready for voice commands!")
+    wake_listener = WakeWordListener(get_speech_config(), session=get_speech_session())
 
     while True:
-        print("[WAITING] Say 'Hi' or 'Hey Speakz' to start.")
--
+        print(f"[WAITING] {wake_listener.prompt}")
+
         if led_connected:
             start_listening_pattern()
 
-        wake_input = recognize_speech()
+        # Blocks until a phrase is spotted; cloud recognition only starts after wake
+        wake_action = wake_listener.wait_for_wake()
 
-        if wake_input and ("hi" in wake_input.lower() or "hey speakz" in wake_input.lower()):
+        if wake_action == "wake":
             if led_connected:
                 start_speaking_pattern()
             speak_greeting()
@@ -121,9 +152,9 @@ def main():
             # Use ask_practice to handle practice initiation
             ask_practice()
 
-            # Check for optimized transcript and ask to present
-            temp_file = "optimized_output.txt"
-            if os.path.exists(temp_file):
+            # Offer to present the optimized script (handed over in memory)
+            script = orchestrator.script_to_present()
+            if script:
                 if led_connected:
                     start_speaking_pattern()
                 send_gesture("handsup")
@@ -138,17 +169,13 @@ def main():
                     if led_connected:
                         start_speaking_pattern()
                     send_gesture("handsup")
-                    try:
-                        subprocess.run([sys.executable, "speakz_optimized.py", temp_file])
-                    except subprocess.CalledProcessError as e:
-                        print(f"[ERROR] Could not run speakz_optimized.py: {e}")
-                        speak_text("Sorry, there was an error with the presentation.")
+                    present_script(script)
                     send_gesture("relax")
                 elif response and "no" in response.lower():
                     if led_connected:
                         start_speaking_pattern()
                     speak_text("Okay, I'll wait. Just say 'Okay, do the presentation' or 'Goodbye'.")
-                    wait_for_user_decision(temp_file, led_connected)
+                    wait_for_user_decision(script, led_connected)
                 else:
                     if led_connected:
                         start_speaking_pattern()
@@ -156,24 +183,18 @@ def main():
                     speak_text("I didn't catch that. Please say yes or no.")
                     send_gesture("relax")
 
-        elif wake_input and ("goodbye" in wake_input.lower() or "exit" in wake_input.lower()):
+        elif wake_action == "exit":
             if led_connected:
                 start_speaking_pattern()
             send_gesture("handsdown")
             speak_text("Goodbye! Speakz is going to sleep.")
             if led_connected:
                 stop_all_patterns()
+            report_tts_cache()
+            latency_stats.report(LATENCY_REPORT_FILE)
+            device_health.monitor.report()
             break
 
-        else:
-            if led_connected:
-                start_speaking_pattern()
-            send_gesture("handtogether")
-            speak_text("I'm listening. Say 'Hi' or 'Hey Speakz' to start.")
-            send_gesture("relax")
-
-        time.sleep(1)
-
 # ------------------- RUN -------------------
 
 if __name__ == "__main__":
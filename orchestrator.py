@@ -0,0 +1,137 @@
+import importlib
+import os
+import subprocess
+import sys
+import time
+from colorama import Fore, init
+
+init(autoreset=True)
+
+OPTIMIZED_SCRIPT_FILE = "optimized_output.txt"  # Only read when no script was produced in this process
+# The stages import these lazily; preloading pays for them before the first practice instead
+STAGE_DEPENDENCIES = ["sounddevice", "scipy.io.wavfile", "speech_recognition", "google.genai"]
+# Everything a stage's own process loads before it can record or speak: its lazy imports plus the
+# speech stack, which the controller already holds from its warm-up
+SPEECH_DEPENDENCIES = ["azure.cognitiveservices.speech", "pygame"]
+STAGE_COLD_START = {
+    "live_transcription": STAGE_DEPENDENCIES + SPEECH_DEPENDENCIES,
+    "speakz_optimized": SPEECH_DEPENDENCIES,
+}
+
+
+class PracticeOrchestrator:
+    """Runs the practice and presentation stages inside the long-lived controller.
+
+    Each stage used to be a fresh `python <script>.py` process that paid
+    interpreter startup, the Azure/numpy/scipy/pygame/sounddevice/genai
+    imports, Azure config and a new gesture worker every time. Here the
+    stage modules are imported once, the presentation speaker (and its
+    synthesizers) is reused, and results are handed over in memory.
+    """
+
+    def __init__(self):
+        self.last_result = None
+        self.optimized_script = None
+        self._speaker = None
+        self.stage_timings = []   # (stage, import_secs, run_secs)
+
+    def preload(self):
+        """Import both stages ahead of time (run in a background thread at startup)"""
+        start = time.perf_counter()
+        import live_transcription
+        import speakz_optimized
+        for name in STAGE_DEPENDENCIES:
+            importlib.import_module(name)
+        print(Fore.CYAN + f"[ORCHESTRATOR] Stages preloaded in {time.perf_counter() - start:.2f}s")
+
+    def run_practice(self):
+        """Record, analyze and give feedback; returns live_transcription's result dict"""
+        start = time.perf_counter()
+        from live_transcription import run_practice_session
+        imported = time.perf_counter()
+        result = run_practice_session()
+        self._record("practice", imported - start, time.perf_counter() - imported)
+        self.last_result = result
+        if result.get("optimized_script"):
+            self.optimized_script = result["optimized_script"]
+        return result
+
+    def script_to_present(self):
+        """The optimized script from this session, else the last one saved on disk"""
+        if self.optimized_script:
+            return self.optimized_script
+        if os.path.exists(OPTIMIZED_SCRIPT_FILE):
+            with open(OPTIMIZED_SCRIPT_FILE, "r", encoding="utf-8") as f:
+                return f.read() or None
+        return None
+
+    def present(self, text=None):
+        """Deliver the optimized speech with gestures using the warm speaker"""
+        text = text or self.script_to_present()
+        if not text:
+            print(Fore.YELLOW + "[ORCHESTRATOR] No optimized script to present")
+            return False
+        start = time.perf_counter()
+        from speakz_optimized import EnhancedSynchronizedSpeaker
+        import latency_stats
+        if self._speaker is None:
+            self._speaker = EnhancedSynchronizedSpeaker()
+        imported = time.perf_counter()
+        delivered = self._speaker.deliver_speech_with_enhanced_gestures(text)
+        self._record("presentation", imported - start, time.perf_counter() - imported)
+        latency_stats.report()
+        return delivered
+
+    def _record(self, stage, import_secs, run_secs):
+        self.stage_timings.append((stage, import_secs, run_secs))
+        print(Fore.CYAN + f"[ORCHESTRATOR] {stage}: in-process start {import_secs:.2f}s | ran {run_secs:.1f}s")
+
+
+def import_stage(module):
+    """Import a stage and the dependencies it would load on first use"""
+    for name in [module] + STAGE_COLD_START.get(module, []):
+        importlib.import_module(name)
+
+
+def measure_cold_start(module, runs=3):
+    """Mean seconds a `python <module>.py` launch spends before the stage can start"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    # A bare `import <module>` no longer loads the stage's lazy dependencies
+    code = f"import orchestrator; orchestrator.import_stage({module!r})"
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=here, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times)
+
+
+def measure_savings(runs=3):
+    """Compare each stage's subprocess cold start with starting it in-process once warm"""
+    print(Fore.CYAN + "[ORCHESTRATOR] Measuring per-cycle startup cost (subprocess vs in-process)...")
+    saved = 0.0
+    for module in ("live_transcription", "speakz_optimized"):
+        cold = measure_cold_start(module, runs)
+        start = time.perf_counter()
+        import_stage(module)
+        first_import = time.perf_counter() - start
+        start = time.perf_counter()
+        import_stage(module)
+        warm = time.perf_counter() - start
+        saved += cold - warm
+        print(f"  {module:20s} subprocess {cold:.2f}s | first in-process import {first_import:.2f}s | "
+              f"warm {warm * 1000:.2f} ms")
+    print(Fore.GREEN + f"[ORCHESTRATOR] ~{saved:.2f}s saved per practice + presentation cycle "
+                       f"(after the one-time import at startup)")
+    return saved
+
+
+# Shared by main_controller and speakz_greeting so results stay in one place
+orchestrator = PracticeOrchestrator()
+
+if __name__ == "__main__":
+    if "--measure-savings" in sys.argv:
+        measure_savings()
+    else:
+        print("Usage: python orchestrator.py --measure-savings")
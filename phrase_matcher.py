@@ -0,0 +1,102 @@
+import re
+from collections import Counter, namedtuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+WORD_CHARS = "a-z0-9'"
+SENTENCE_ENDS = ".!?"  # a phrase never spans these ("kind. Of course" is not "kind of")
+
+PhraseMatch = namedtuple("PhraseMatch", ["phrase", "value", "start", "end", "char_start", "char_end", "time"])
+
+
+class PhraseMatcher:
+    """A phrase table compiled into one regular expression, matched in one pass.
+
+    Phrases only match whole words ("hi" never matches inside "this") and
+    words may be separated by whitespace or punctuation other than a
+    sentence end. Alternatives
+    are ordered longest first, so the longest phrase starting at a word
+    wins, and matches never overlap. The scan runs inside the regex engine
+    instead of a Python loop over tokens.
+    """
+
+    def __init__(self, phrases):
+        """
+        Args:
+            phrases (dict | iterable): phrase -> value mapping, or just phrases
+                (each phrase is then its own value)
+        """
+        items = phrases.items() if isinstance(phrases, dict) else ((p, p) for p in phrases)
+        self.values = {}    # normalized phrase ("you know") -> value
+        self.order = {}
+        for phrase, value in items:
+            words = TOKEN_PATTERN.findall(phrase.lower())
+            if not words:
+                continue
+            normalized = " ".join(words)
+            self.order.setdefault(normalized, len(self.order))
+            self.values[normalized] = value
+        self.size = len(self.values)
+        separator = f"[^{WORD_CHARS}{re.escape(SENTENCE_ENDS)}]+"
+        # No capture groups: they would disable the regex engine's fast scanning
+        alternatives = "|".join(separator.join(map(re.escape, phrase.split()))
+                                for phrase in sorted(self.values, key=lambda p: (-len(p.split()), -len(p))))
+        self.pattern = re.compile(f"(?<![{WORD_CHARS}])(?:{alternatives or '(?!)'})(?![{WORD_CHARS}])")
+
+    def find_all(self, text, word_times=None):
+        """
+        Find every phrase occurrence in `text`
+
+        Args:
+            text (str): Text to scan
+            word_times (list): Optional (start_sec, end_sec) per word token of
+                `text`, e.g. StreamingTranscriber.word_times()
+
+        Returns:
+            list: PhraseMatch tuples in text order; start/end are word token
+                indices, char_start/char_end index into `text`, and time is
+                (start_sec, end_sec) when word_times covers the match
+        """
+        lowered = text.lower()
+        values = self.values
+        find_tokens = TOKEN_PATTERN.findall
+        timed = len(word_times) if word_times is not None else 0
+        matches = []
+        token = 0       # word tokens before the current match
+        scanned = 0
+        for m in self.pattern.finditer(lowered):
+            char_start, char_end = m.span()
+            # Matches sit on word boundaries, so counting tokens in the gap gives the index
+            token += len(find_tokens(lowered, scanned, char_start))
+            scanned = char_end
+            phrase = m.group()
+            if phrase not in values:
+                # Words were split by something other than one space ("you,  know")
+                phrase = " ".join(find_tokens(phrase))
+            end = token + phrase.count(" ") + 1
+            time = (word_times[token][0], word_times[end - 1][1]) if end <= timed else None
+            matches.append(PhraseMatch(phrase, values[phrase], token, end, char_start, char_end, time))
+            token = end
+        return matches
+
+    def count_all(self, text):
+        """Phrase -> occurrence count, in order of first appearance, without building matches"""
+        counts = {}
+        for found, count in Counter(self.pattern.findall(text.lower())).items():
+            phrase = found if found in self.values else " ".join(TOKEN_PATTERN.findall(found))
+            counts[phrase] = counts.get(phrase, 0) + count
+        return counts
+
+    def longest_match(self, text):
+        """Longest phrase (by characters) found in `text`, or None; ties go to table order"""
+        matches = self.find_all(text)
+        if not matches:
+            return None
+        return min(matches, key=lambda m: (-len(m.phrase), self.order[m.phrase]))
+
+
+def count_matches(matches):
+    """Phrase -> occurrence count, in order of first appearance"""
+    counts = {}
+    for match in matches:
+        counts[match.phrase] = counts.get(match.phrase, 0) + 1
+    return counts
@@ -0,0 +1,97 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from colorama import Fore, init
+
+init(autoreset=True)
+
+ENTRY_POINTS = ["main_controller", "touch_server", "live_transcription"]
+
+# Each of these should only be imported by the code path that uses it, never at startup
+HEAVY_MODULES = ["azure.cognitiveservices.speech", "pygame", "sounddevice", "scipy.io.wavfile",
+                 "speech_recognition", "google.genai"]
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def import_profile(module):
+    """
+    Import `module` in a fresh interpreter under `python -X importtime`
+
+    Returns:
+        dict: wall_ms (whole process), total_ms (the module's cumulative import),
+              modules {name: (self_ms, cumulative_ms, depth)} imported on its behalf
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=here,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    # A module is printed after everything it imported, so its subtree is the nested run just above it
+    end = next(i for i, entry in enumerate(entries) if entry[0] == module and entry[3] == 0)
+    start = end
+    while start > 0 and entries[start - 1][3] > 0:
+        start -= 1
+    modules = {name: (self_ms, cumulative_ms, depth) for name, self_ms, cumulative_ms, depth in entries[start:end + 1]}
+    return {"wall_ms": wall_ms, "total_ms": modules[module][1], "modules": modules}
+
+
+def package_costs(modules):
+    """Self time summed per top-level package (numpy, pygame, requests, ...)"""
+    costs = defaultdict(float)
+    for name, (self_ms, _, _) in modules.items():
+        costs[name.split(".")[0]] += self_ms
+    return costs
+
+
+def report(module, profile, top=10):
+    modules = profile["modules"]
+    print(Fore.CYAN + f"\n[STARTUP] {module}: import {profile['total_ms']:.0f} ms | "
+                      f"process {profile['wall_ms']:.0f} ms ({len(modules)} modules)")
+
+    # Direct imports of the entry point, with everything they pulled in
+    direct = [(name, cumulative) for name, (_, cumulative, depth) in modules.items()
+              if depth == 1 and name != module]
+    print("  Slowest direct imports (cumulative):")
+    for name, cumulative in sorted(direct, key=lambda item: -item[1])[:top]:
+        print(f"    {name:32s} {cumulative:8.1f} ms")
+
+    print("  Slowest packages (own import time):")
+    for name, self_ms in sorted(package_costs(modules).items(), key=lambda item: -item[1])[:top]:
+        print(f"    {name:32s} {self_ms:8.1f} ms")
+
+    eager = [name for name in HEAVY_MODULES if name in modules]
+    if eager:
+        print(Fore.RED + f"  Loaded at startup: {', '.join(eager)}")
+    else:
+        print(Fore.GREEN + "  No heavy dependency loaded at startup")
+
+
+def profile_startup(entry_points=ENTRY_POINTS, runs=3, top=10):
+    """Profile each entry point's imports; the fastest of `runs` is reported to damp noise"""
+    profiles = {}
+    for module in entry_points:
+        profiles[module] = min((import_profile(module) for _ in range(runs)), key=lambda p: p["total_ms"])
+        report(module, profiles[module], top)
+    return profiles
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-module import cost of the SpeakZ entry points")
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS, help="Entry points to profile")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per entry point")
+    parser.add_argument("--top", type=int, default=10, help="Rows per table")
+    args = parser.parse_args()
+    profile_startup(args.modules, args.runs, args.top)
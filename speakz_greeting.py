@@ -1,45 +1,151 @@
-import azure.cognitiveservices.speech as speechsdk
+from lazy_import import lazy_module
 from gesture_sender import send_gesture
+from tts_audio import play_wav_bytes, init_mixer
+from tts_cache import TTSCache
+from speech_session import SpeechSession, PRINT_SPEECH_TIMING
+from wake_word import WakeWordListener
+from orchestrator import orchestrator
 from datetime import datetime
-import subprocess
 import os
-import sys
 import time
 import threading
 
+speechsdk = lazy_module("azure.cognitiveservices.speech")
+
 # ==== Azure Speech Config ====
 speech_key = "1a0oyWt4KJ7CiF6OjOqZXq4cYzbkDCx8TWAqnVQJoZ4LjiKZyA0GJQQJ99BGACYeBjFXJ3w3AAAYACOGMrMv"
 service_region = "eastus"
-speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
-speech_config.speech_synthesis_voice_name = "en-GB-RyanNeural"
+TTS_VOICE = "en-GB-RyanNeural"
+TTS_OUTPUT_FORMAT = "Riff24Khz16BitMonoPcm"  # SpeechSynthesisOutputFormat member name
 
 LOG_FILE = "practice_log.txt"
+TTS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tts_cache")
+
+# Built on first use so importing this module loads neither the Azure SDK nor the cache directory
+_speech_config = None
+_speech_session = None
+_tts_cache = None
+_speech_lock = threading.RLock()
+
+def get_speech_config():
+    global _speech_config
+    with _speech_lock:
+        if _speech_config is None:
+            config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
+            config.speech_synthesis_voice_name = TTS_VOICE
+            config.set_speech_synthesis_output_format(getattr(speechsdk.SpeechSynthesisOutputFormat, TTS_OUTPUT_FORMAT))
+            _speech_config = config
+        return _speech_config
+
+def get_speech_session():
+    global _speech_session
+    with _speech_lock:
+        if _speech_session is None:
+            _speech_session = SpeechSession(get_speech_config())
+        return _speech_session
+
+def get_tts_cache():
+    global _tts_cache
+    with _speech_lock:
+        if _tts_cache is None:
+            _tts_cache = TTSCache(TTS_CACHE_DIR)
+        return _tts_cache
+
+# Fixed phrases pre-synthesized at startup so the conversation loop plays them from disk
+WARMUP_PHRASES = [
+    "Good morning!",
+    "Good afternoon!",
+    "Good evening! I'm Speakz, your presentation buddy. How can I help you today?",
+    "I'm Speakz, your presentation buddy.",
+    "How can I help you today?",
+    "Would you like to practice your presentation now? Please say yes or no.",
+    "Let's begin. Start your presentation after the beep.",
+    "Feedback delivered! Ready for another practice?",
+    "Alright! Just say 'Hey Speakz' again when you're ready.",
+    "Sorry, I didn't get that. Please say yes or no.",
+    "I'm listening. Just say 'Hey Speakz' to start.",
+    "Goodbye! Have a great day.",
+]
+
+# Only these are served from the TTS cache (warm_tts_cache adds its phrases); any other text,
+# like the practice count or generated feedback, is streamed to the speaker and never stored
+cached_phrases = set(WARMUP_PHRASES)
+
+# Called with the text just before each phrase starts playing (touch_server times first words with it)
+speech_start_listeners = []
 
 # ==== Speak Text ====
+def synthesize_cached(text):
+    """WAV bytes for `text`, from the on-disk cache or a fresh synthesis"""
+    tts_cache = get_tts_cache()
+    audio = tts_cache.get(text, TTS_VOICE, TTS_OUTPUT_FORMAT)
+    if audio is None:
+        result = get_speech_session().synthesize(text)
+        if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+            return None
+        audio = result.audio_data
+        tts_cache.put(text, TTS_VOICE, TTS_OUTPUT_FORMAT, audio)
+    return audio
+
+def _notify_speech_start(text):
+    for listener in speech_start_listeners:
+        listener(text)
+
 def speak_text(text):
-    synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config)
-    result = synthesizer.speak_text_async(text).get()
-    if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
-        print("[ERROR] Speech synthesis failed.")
+    start = time.perf_counter()
+    if text in cached_phrases:
+        audio = synthesize_cached(text)
+        if audio is None:
+            print("[ERROR] Speech synthesis failed.")
+            return
+        ready = time.perf_counter()
+        _notify_speech_start(text)
+        play_wav_bytes(audio)
+    else:
+        first_audio = []
+
+        def on_first_audio():
+            first_audio.append(time.perf_counter())
+            _notify_speech_start(text)
+
+        result = get_speech_session().speak(text, on_first_audio=on_first_audio)
+        if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+            print("[ERROR] Speech synthesis failed.")
+            return
+        ready = first_audio[0] if first_audio else time.perf_counter()
+    if PRINT_SPEECH_TIMING:
+        print(f"[TIMING] speak_text: audio ready in {ready - start:.3f}s | spoke for {time.perf_counter() - ready:.2f}s")
+
+def warm_up_speech(phrases=WARMUP_PHRASES):
+    """Open the speech connections and the audio mixer, then fill the TTS cache"""
+    get_speech_session().warm_up()
+    init_mixer()
+    warm_tts_cache(phrases)
+
+def warm_tts_cache(phrases=WARMUP_PHRASES):
+    """Pre-synthesize fixed phrases and serve them from the cache from now on"""
+    cached_phrases.update(phrases)
+    for phrase in phrases:
+        synthesize_cached(phrase)
+    report_tts_cache()
+
+def report_tts_cache():
+    stats = get_tts_cache().stats()
+    print(f"[TTS CACHE] hits: {stats['hits']} | misses: {stats['misses']} | "
+          f"hit rate: {stats['hit_rate']:.0%} | evictions: {stats['evictions']} | {stats['bytes'] / 1024:.0f} KB")
 
 # ==== Speak with Gesture at Same Time ====
 def speak_with_gesture(text, gesture=None):
     """Speak text and do gesture at the SAME time"""
     if gesture:
-        gesture_thread = threading.Thread(target=send_gesture, args=(gesture,))
-        gesture_thread.start()
+        send_gesture(gesture)  # Hands off to the actuator bus and returns immediately
     
     speak_text(text)
-    
-    if gesture:
-        gesture_thread.join()  # Wait for gesture to finish
 
 # ==== Recognize One Speech ====
 def recognize_speech():
-    audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
-    recognizer = speechsdk.SpeechRecognizer(speech_config=speech_config, audio_config=audio_config)
     print("[LISTENING] Please speak now...")
-    result = recognizer.recognize_once_async().get()
+    result = get_speech_session().recognize_once()
     
     if result.reason == speechsdk.ResultReason.RecognizedSpeech:
         print(f"[RECOGNIZED] {result.text}")
@@ -86,18 +192,20 @@ def update_practice_log():
 
 # ==== Call Presentation Recording Script ====
 def record_and_analyze():
+    """Run the practice session in-process; returns its result dict, or None on error"""
     try:
-        print("[INFO] Launching live_transcription.py...")
-        script_path = os.path.join(os.path.dirname(__file__), "live_transcription.py")
-        subprocess.run([sys.executable, script_path], check=True)
+        print("[INFO] Starting practice session...")
+        result = orchestrator.run_practice()
         print("[INFO] Recording and analysis finished.")
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Could not run script: {e}")
+        return result
+    except Exception as e:
+        print(f"[ERROR] Practice session failed: {e}")
         speak_with_gesture("Sorry, there was an error with the recording.", "handsdown")
+        return None
 
 # ==== Ask to Practice with Retry Loop ====
 def ask_practice():
-    """Ask user until they say yes or no."""
+    """Ask user until they say yes or no; returns the practice result, if one ran."""
     while True:
         speak_with_gesture("Would you like to practice your presentation now? Please say yes or no.", "handtogether")
         response = recognize_speech()
@@ -110,42 +218,36 @@ def ask_practice():
                 speak_with_gesture(f"This is your {count} time practicing today. Great job!", "handsup")
                 speak_with_gesture("Let's begin. Start your presentation after the beep.", "point")
                 send_gesture("relax")
-                record_and_analyze()
+                result = record_and_analyze()
                 speak_with_gesture("Feedback delivered! Ready for another practice?", "handtogether")
-                break
+                return result
 
             elif "no" in lower_response:
-                speak_with_gesture("Alright! Just say 'Hi' again when you're ready.", "handsdown")
+                speak_with_gesture("Alright! Just say 'Hey Speakz' again when you're ready.", "handsdown")
                 send_gesture("relax")
-                break
+                return None
             else:
                 speak_with_gesture("Sorry, I didn't get that. Please say yes or no.", "handtogether")
 
 # ==== Wake Word Loop ====
 def listen_for_wake_word():
+    threading.Thread(target=warm_up_speech, daemon=True).start()
     send_gesture("relax")
+    wake_listener = WakeWordListener(get_speech_config(), session=get_speech_session())
     
     while True:
-        print("[WAITING] Say 'Hi' or 'Hey Speakz' to start.")
-        spoken_text = recognize_speech()
-
-        if spoken_text:
-            lower_text = spoken_text.lower()
-
-            if "hi" in lower_text or "hey speakz" in lower_text:
-                speak_greeting()
-                ask_practice()
-
-            elif "goodbye" in lower_text or "exit" in lower_text:
-                speak_with_gesture("Goodbye! Have a great day.", "handsdown")
-                send_gesture("relax")
-                break
-
-            else:
-                speak_with_gesture("I'm listening. Just say 'Hi' or 'Hey Speakz' to start.", "handtogether")
-                send_gesture("relax")
-        
-        time.sleep(1)
+        print(f"[WAITING] {wake_listener.prompt}")
+        action = wake_listener.wait_for_wake()
+
+        if action == "wake":
+            speak_greeting()
+            ask_practice()
+
+        elif action == "exit":
+            speak_with_gesture("Goodbye! Have a great day.", "handsdown")
+            send_gesture("relax")
+            report_tts_cache()
+            break
 
 # ==== Entry Point ====
 if __name__ == "__main__":
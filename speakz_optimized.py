@@ -1,23 +1,46 @@
-import azure.cognitiveservices.speech as speechsdk
 import sys
 import os
+import io
 import time
+import wave
 import threading
 import re
 import json
 from collections import defaultdict
+from queue import Queue, Full, Empty
 import requests
 from enhance_geature_sender import send_gesture
+from esp32_client import get_client
+import device_health
+from phrase_matcher import PhraseMatcher
+from gesture_scheduler import GestureScheduler
+from word_boundary_sync import WordBoundaryGestureSync, SyntheticWordBoundarySource
+from timeline_upload import TimelineUpload
+import latency_stats
+from tts_audio import play_wav_bytes
+from lazy_import import lazy_module
+
+speechsdk = lazy_module("azure.cognitiveservices.speech")
 
 # ==== Azure Speech Config ====
 speech_key = "1a0oyWt4KJ7CiF6OjOqZXq4cYzbkDCx8TWAqnVQJoZ4LjiKZyA0GJQQJ99BGACYeBjFXJ3w3AAAYACOGMrMv"
 service_region = "eastus"
 
-speech_config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
-speech_config.speech_synthesis_voice_name = "en-GB-RyanNeural"
+_speech_config = None
+
+def get_speech_config():
+    """Built when the first synthesizer is, so importing this module doesn't load the Azure SDK"""
+    global _speech_config
+    if _speech_config is None:
+        config = speechsdk.SpeechConfig(subscription=speech_key, region=service_region)
+        config.speech_synthesis_voice_name = "en-GB-RyanNeural"
+        # RIFF PCM so in-memory sentence audio can be played back locally
+        config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm)
+        _speech_config = config
+    return _speech_config
 
-# ESP32 Configuration
-ESP32_IP = "192.168.213.5"
+# ESP32 Configuration (address comes from the esp32_client device registry)
+gesture_client = get_client("gesture")
 
 # ===== ENHANCED GESTURE MAPPING CONFIG =====
 GESTURE_TRIGGERS = {
@@ -82,6 +105,9 @@ GESTURE_TRIGGERS = {
     "show": "point",
 }
 
+# Compiled once at import; timeline building matches every sentence against it
+GESTURE_TRIGGER_MATCHER = PhraseMatcher(GESTURE_TRIGGERS)
+
 AZURE_TO_ESP32_MAPPING = {
     "handsup": "handaway",
     "handtogether": "handtogether", 
@@ -93,35 +119,85 @@ AZURE_TO_ESP32_MAPPING = {
 GESTURE_DURATION = 2.0
 SPEECH_DELAY_AFTER_GESTURE = 0.1
 CHUNK_DURATION = 1.5
+GESTURE_LEAD_SEC = 0.1  # Start servos slightly ahead of the words
+GESTURE_TIMING = "word_boundary"  # "word_boundary" (TTS events) or "estimate" (words/sec guess)
+DELIVERY_MODE = "pipelined"       # "pipelined" (sentence by sentence) or "single" (one TTS request)
+PIPELINE_LOOKAHEAD = 2            # Synthesized sentences allowed to wait for playback
+GESTURE_TRANSPORT = "upload"      # "upload" (whole timeline runs on the board) or "per_gesture" (one GET each)
+
+def wav_duration(wav_bytes):
+    """Seconds of audio in a RIFF PCM clip, from its own header (rate, width, data size)"""
+    try:
+        with wave.open(io.BytesIO(wav_bytes)) as clip:
+            frame_bytes = clip.getsampwidth() * clip.getnchannels()
+            # Read rather than trust nframes: streamed RIFF headers may carry a placeholder size
+            frames = len(clip.readframes(clip.getnframes())) // frame_bytes
+            return frames / clip.getframerate()
+    except (wave.Error, EOFError):
+        return 0.0
 
 class EnhancedSynchronizedSpeaker:
     def __init__(self):
         self.current_gesture = "relax"
         self.gesture_lock = threading.Lock()
-        self.synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config)
+        self._synthesizer = None
+        self._memory_synthesizer = None
+        self._sentence_boundaries = []
         self.gesture_timeline = []
         self.is_playing = False
         self.start_time = None
+        self.scheduler = None
+        self.word_sync = None
+        self.timeline_upload = None
+        self._start_timeline_on_audio = False
+
+    @property
+    def synthesizer(self):
+        # Created on first use so timelines can be built without an audio device
+        if self._synthesizer is None:
+            self._synthesizer = speechsdk.SpeechSynthesizer(speech_config=get_speech_config())
+            self._synthesizer.synthesis_word_boundary.connect(self.on_word_boundary)
+            self._synthesizer.synthesizing.connect(self.on_audio_chunk)
+        return self._synthesizer
+
+    @property
+    def memory_synthesizer(self):
+        """Synthesizer that returns audio instead of playing it, for pipelined delivery"""
+        if self._memory_synthesizer is None:
+            self._memory_synthesizer = speechsdk.SpeechSynthesizer(speech_config=get_speech_config(), audio_config=None)
+            self._memory_synthesizer.synthesis_word_boundary.connect(
+                lambda evt: self._sentence_boundaries.append(
+                    (evt.text_offset, evt.word_length, evt.audio_offset / 10_000_000)))
+        return self._memory_synthesizer
+
+    def on_word_boundary(self, evt):
+        word_sync = self.word_sync
+        timeline_upload = self.timeline_upload
+        if word_sync is not None:
+            word_sync.azure_handler(evt)
+            if timeline_upload is not None:
+                # SDK callback thread: the retime request goes out on the upload's sender thread
+                timeline_upload.flush_async()
+
+    def on_audio_chunk(self, evt):
+        # Board clock zero is the first audio of a single-shot utterance, like the first word when pipelined
+        timeline_upload = self.timeline_upload
+        if self._start_timeline_on_audio and timeline_upload is not None:
+            self._start_timeline_on_audio = False
+            timeline_upload.start_async()
         
     def test_esp32_connection(self):
-        try:
-            response = requests.get(f"http://{ESP32_IP}/preset?action=relax", timeout=2)
-            if response.status_code == 200:
-                print("✅ ESP32 connection successful")
-                return True
-            else:
-                print(f"⚠️ ESP32 responded with status {response.status_code}")
-                return False
-        except Exception as e:
-            print(f"❌ ESP32 connection failed: {e}")
-            return False
+        # Cached by the health monitor; no test pose is sent before delivery
+        if device_health.is_available("gesture"):
+            print("✅ ESP32 connection successful")
+            return True
+        print("❌ ESP32 connection failed: controller unreachable")
+        return False
     
     def send_esp32_gesture(self, azure_gesture):
         esp32_gesture = AZURE_TO_ESP32_MAPPING.get(azure_gesture, "relax")
-        url = f"http://{ESP32_IP}/preset?action={esp32_gesture}"
-        
         try:
-            response = requests.get(url, timeout=1)
+            response = gesture_client.preset(esp32_gesture)
             if response.status_code == 200:
                 print(f"🤲 ESP32 gesture '{esp32_gesture}' sent successfully")
                 return True
@@ -143,57 +219,57 @@ class EnhancedSynchronizedSpeaker:
         return base_duration + pause_time
     
     def create_gesture_timeline_from_text(self, text):
-        sentences = re.split(r'[.!?]+', text)
         timeline = []
         current_time = 0.0
         timeline.append({"time": 0.0, "action": "relax", "text": "[INITIAL]"})
         
-        for sentence in sentences:
-            sentence = sentence.strip()
+        for sentence_match in re.finditer(r'[^.!?]+', text):
+            sentence = sentence_match.group().strip()
             if not sentence:
                 continue
-            gesture = self.find_gesture_for_text(sentence)
-            if gesture:
-                esp32_gesture = AZURE_TO_ESP32_MAPPING.get(gesture, "relax")
-                timeline.append({"time": current_time, "action": esp32_gesture, "text": sentence})
+            match = self.find_gesture_match(sentence_match.group())
+            if match:
+                esp32_gesture = AZURE_TO_ESP32_MAPPING.get(match.value, "relax")
+                timeline.append({"time": current_time, "action": esp32_gesture, "text": sentence,
+                                 "char_offset": sentence_match.start() + match.char_start})
             sentence_duration = self.estimate_speech_duration(sentence)
             current_time += sentence_duration + 0.5
         
         timeline.append({"time": current_time + 1.0, "action": "relax", "text": "[FINAL]"})
         return timeline
     
+    def find_gesture_match(self, text_chunk):
+        match = GESTURE_TRIGGER_MATCHER.longest_match(text_chunk)
+        if match:
+            print(f"🎯 Found trigger '{match.phrase}' -> gesture '{match.value}'")
+        return match
+
     def find_gesture_for_text(self, text_chunk):
-        text_lower = text_chunk.lower()
-        sorted_triggers = sorted(GESTURE_TRIGGERS.keys(), key=len, reverse=True)
-        for trigger in sorted_triggers:
-            if trigger in text_lower:
-                print(f"🎯 Found trigger '{trigger}' -> gesture '{GESTURE_TRIGGERS[trigger]}'")
-                return GESTURE_TRIGGERS[trigger]
-        return None
-    
-    def gesture_sync_thread(self, timeline):
-        if not timeline:
-            return
-        print("🎭 Starting gesture synchronization thread...")
-        sent_gestures = set()
-        first_gesture = timeline[0]
-        self.send_esp32_gesture(first_gesture["action"])
-        sent_gestures.add(first_gesture["time"])
-        
-        while self.is_playing:
-            if not self.start_time:
-                time.sleep(0.05)
-                continue
-            current_time = time.time() - self.start_time
-            for gesture in timeline:
-                if (gesture["time"] <= current_time + 0.1 and 
-                    gesture["time"] not in sent_gestures):
-                    print(f"⏰ {gesture['time']:.1f}s: Sending gesture '{gesture['action']}' | Text: {gesture['text'][:50]}...")
-                    self.send_esp32_gesture(gesture["action"])
-                    sent_gestures.add(gesture["time"])
-            time.sleep(0.05)
-        print("🎭 Gesture synchronization thread ended")
+        match = self.find_gesture_match(text_chunk)
+        return match.value if match else None
     
+    def fire_timeline_gesture(self, gesture):
+        print(f"⏰ {gesture['time']:.1f}s: Sending gesture '{gesture['action']}' | Text: {gesture['text'][:50]}...")
+        self.send_esp32_gesture(gesture["action"])
+
+    def report_gesture_drift(self, word_sync):
+        gestures, mean_drift, max_drift, last_drift = word_sync.drift_summary()
+        print(f"📏 Word-boundary vs estimated timing over {gestures} gestures: "
+              f"avg {mean_drift:.2f}s, max {max_drift:.2f}s, last {last_drift:+.2f}s")
+
+    def measure_gesture_drift(self, text, source=None):
+        """Build the timeline for `text` and replay synthetic word boundaries through it, offline"""
+        timeline = self.create_gesture_timeline_from_text(text)
+        word_sync = WordBoundaryGestureSync(GestureScheduler(self.fire_timeline_gesture), timeline)
+        (source or SyntheticWordBoundarySource()).play(text, word_sync.on_word_boundary)
+        self.report_gesture_drift(word_sync)
+        return word_sync.drift
+
+    def report_gesture_timing(self):
+        fired, mean_late, max_late = self.scheduler.lateness_summary()
+        print(f"⏱️ Gestures fired: {fired}/{len(self.gesture_timeline)} | "
+              f"lateness avg {mean_late * 1000:.0f} ms, max {max_late * 1000:.0f} ms")
+
     def speak_text_with_azure_and_gestures(self, text):
         print(f"🎭 Preparing synchronized speech delivery...")
         print("=" * 60)
@@ -202,14 +278,65 @@ class EnhancedSynchronizedSpeaker:
         for i, gesture in enumerate(self.gesture_timeline):
             print(f"  {i+1:2d}. {gesture['time']:5.1f}s - {gesture['action']:12s} | {gesture.get('text', '')[:40]}")
         self.is_playing = True
-        gesture_thread = threading.Thread(target=self.gesture_sync_thread, args=(self.gesture_timeline,))
-        gesture_thread.daemon = True
-        gesture_thread.start()
+        if GESTURE_TRANSPORT == "upload":
+            # With word-boundary timing, trigger gestures stay held on the board until their retime arrives
+            self.timeline_upload = TimelineUpload(gesture_client, self.gesture_timeline, lead_sec=GESTURE_LEAD_SEC,
+                                                  hold_triggers=GESTURE_TIMING == "word_boundary")
+            if not self.timeline_upload.upload():
+                print("⚠️ Board can't run timelines, sending gestures one by one")
+                self.timeline_upload = None
+        if self.timeline_upload is not None:
+            self.scheduler = None
+            if GESTURE_TIMING == "word_boundary":
+                # Real trigger-word offsets are sent to the board as retimes
+                self.word_sync = WordBoundaryGestureSync(self.timeline_upload, self.gesture_timeline)
+        else:
+            print("🎭 Starting gesture scheduler...")
+            self.scheduler = GestureScheduler(self.fire_timeline_gesture, lead_sec=GESTURE_LEAD_SEC)
+            if GESTURE_TIMING == "word_boundary":
+                # Trigger-word gestures wait for their word-boundary events
+                self.word_sync = WordBoundaryGestureSync(self.scheduler, self.gesture_timeline)
+            for gesture in self.gesture_timeline:
+                if self.word_sync is None or gesture.get("char_offset") is None:
+                    self.scheduler.schedule(gesture)
         print(f"\n🗣️ Starting Azure TTS for text: {text[:100]}...")
         self.start_time = time.time()
-        result = self.synthesizer.speak_text_async(text).get()
+        if self.scheduler is not None:
+            self.scheduler.start(self.start_time)
+        try:
+            if DELIVERY_MODE == "pipelined":
+                result = self.speak_pipelined(text)
+            else:
+                self._start_timeline_on_audio = self.timeline_upload is not None
+                result = self.synthesizer.speak_text_async(text).get()
+        except Exception:
+            # Leave nothing running on the board or the host before the caller falls back
+            self.is_playing = False
+            self._start_timeline_on_audio = False
+            if self.scheduler is not None:
+                self.scheduler.cancel()
+            if self.timeline_upload is not None:
+                self.timeline_upload.cancel()
+            self.timeline_upload = None
+            self.word_sync = None
+            raise
         self.is_playing = False
-        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+        self._start_timeline_on_audio = False   # in case synthesis produced no audio
+        if self.scheduler is not None:
+            self.scheduler.cancel()
+            self.scheduler.join(timeout=1)
+            self.report_gesture_timing()
+        else:
+            self.timeline_upload.report()
+        if self.word_sync is not None:
+            self.report_gesture_drift(self.word_sync)
+            self.word_sync = None
+        completed = result is not None and result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted
+        if self.timeline_upload is not None:
+            # Speech is over; the host sends the closing relax itself
+            self.timeline_upload.cancel()
+        self.timeline_upload = None
+        if completed:
             speech_duration = time.time() - self.start_time
             print(f"✅ Speech completed in {speech_duration:.1f}s")
             time.sleep(0.5)
@@ -217,14 +344,97 @@ class EnhancedSynchronizedSpeaker:
             print("🤲 Final relax gesture sent")
         else:
             print("❌ Speech synthesis failed.")
-            if result.reason == speechsdk.ResultReason.Canceled:
+            if result is not None and result.reason == speechsdk.ResultReason.Canceled:
                 cancellation = result.cancellation_details
                 print(f"[CANCELED] Reason: {cancellation.reason}")
                 if cancellation.reason == speechsdk.CancellationReason.Error:
                     print(f"[ERROR] Details: {cancellation.error_details}")
         print("=" * 60)
         print("✅ Enhanced synchronized speech delivery complete!")
-        return result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted
+        return completed
+
+    def speak_pipelined(self, text):
+        """Play the script sentence by sentence, synthesizing ahead while each one plays.
+
+        Returns the last synthesis result (the failing one, if any); an exception
+        raised while synthesizing is re-raised here.
+        """
+        sentences = [(m.start(), m.group()) for m in re.finditer(r'[^.!?]+[.!?]*', text) if m.group().strip()]
+        ready = Queue(maxsize=PIPELINE_LOOKAHEAD)
+        producer = threading.Thread(target=self._synthesize_sentences, args=(sentences, ready), daemon=True)
+        producer.start()
+        try:
+            return self._play_sentences(sentences, ready)
+        finally:
+            self.is_playing = False  # also releases a producer blocked on a full queue
+
+    def _play_sentences(self, sentences, ready):
+        result = None
+        while True:
+            item = self._get_while_playing(ready)
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            offset, sentence, result, boundaries = item
+            if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+                break
+            sentence_start = time.time() - self.start_time
+            if offset == sentences[0][0]:
+                print(f"⏱️ Time to first word: {sentence_start:.2f}s")
+                if self.timeline_upload is not None:
+                    # Board clock zero is the first word; the producer already retimed from there
+                    self.timeline_upload.start()
+            if self.word_sync is not None and self.timeline_upload is None:
+                # Word offsets are relative to this sentence's audio, which starts now
+                for text_offset, word_length, audio_offset in boundaries:
+                    self.word_sync.on_word_boundary(offset + text_offset, word_length, sentence_start + audio_offset)
+            play_wav_bytes(result.audio_data)
+        return result
+
+    def _synthesize_sentences(self, sentences, ready):
+        audio_cursor = 0.0  # where this sentence will start, measured from the first word
+        end = None          # None when done, else the exception that stopped synthesis
+        try:
+            for offset, sentence in sentences:
+                if not self.is_playing:
+                    return
+                self._sentence_boundaries = []
+                result = self.memory_synthesizer.speak_text_async(sentence).get()
+                if self.timeline_upload is not None and self.word_sync is not None:
+                    # Sentences play back to back, so their offsets are known before playback reaches them
+                    for text_offset, word_length, audio_offset in self._sentence_boundaries:
+                        self.word_sync.on_word_boundary(offset + text_offset, word_length, audio_cursor + audio_offset)
+                    self.timeline_upload.flush()
+                audio_cursor += wav_duration(result.audio_data)
+                if not self._put_while_playing(ready, (offset, sentence, result, self._sentence_boundaries)):
+                    return
+                if result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted:
+                    return
+        except Exception as e:
+            end = e
+        finally:
+            # Always tell the player to stop waiting, whatever ended synthesis
+            self._put_while_playing(ready, end)
+
+    def _put_while_playing(self, ready, item):
+        """Blocking put that gives up once playback stops, so the producer can't hang"""
+        while self.is_playing:
+            try:
+                ready.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _get_while_playing(self, ready):
+        """Next queued sentence, or None once playback is stopped from elsewhere"""
+        while self.is_playing:
+            try:
+                return ready.get(timeout=0.1)
+            except Empty:
+                continue
+        return None
 
     def deliver_speech_with_enhanced_gestures(self, text):
         if not text.strip():
@@ -251,9 +461,15 @@ class EnhancedSynchronizedSpeaker:
 
 def deliver_speech(text: str):
     speaker = EnhancedSynchronizedSpeaker()
-    return speaker.deliver_speech_with_enhanced_gestures(text)
+    delivered = speaker.deliver_speech_with_enhanced_gestures(text)
+    latency_stats.report()
+    return delivered
 
 if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure-drift":
+        with open(sys.argv[2], "r", encoding="utf-8") as f:
+            EnhancedSynchronizedSpeaker().measure_gesture_drift(f.read())
+        sys.exit(0)
     if len(sys.argv) > 1:
         input_path = sys.argv[1]
         if os.path.exists(input_path):
@@ -272,6 +488,6 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             print("\n⏹️ Input cancelled by user")
             try:
-                requests.get(f"http://{ESP32_IP}/preset?action=relax", timeout=1)
+                gesture_client.preset("relax")
             except:
                 pass
@@ -0,0 +1,115 @@
+import threading
+import time
+from lazy_import import lazy_module
+
+speechsdk = lazy_module("azure.cognitiveservices.speech")
+
+PRINT_SPEECH_TIMING = True
+
+
+class SpeechSession:
+    """Azure synthesizer, recognizer and microphone config shared by the whole process.
+
+    Objects are created once (on first use or by warm_up()) and reused for
+    every utterance, and warm_up() pre-opens their service connections so
+    the first real request doesn't pay the handshake either. Each call
+    records how long was spent on setup versus the actual work.
+    """
+
+    def __init__(self, speech_config):
+        self.speech_config = speech_config
+        self._synthesizer = None
+        self._speaker = None
+        self._on_first_audio = None
+        self._recognizer = None
+        self._audio_config = None
+        self._connections = []
+        self._lock = threading.Lock()
+        self.timings = []
+
+    def _synthesizer_instance(self):
+        with self._lock:
+            if self._synthesizer is None:
+                # audio_config=None: audio comes back as bytes and is played locally
+                self._synthesizer = speechsdk.SpeechSynthesizer(speech_config=self.speech_config, audio_config=None)
+            return self._synthesizer
+
+    def _speaker_instance(self):
+        with self._lock:
+            if self._speaker is None:
+                # Default speaker output: audio plays as it streams in and is not kept
+                self._speaker = speechsdk.SpeechSynthesizer(speech_config=self.speech_config)
+                self._speaker.synthesizing.connect(self._on_speaker_audio)
+            return self._speaker
+
+    def _on_speaker_audio(self, evt):
+        callback, self._on_first_audio = self._on_first_audio, None
+        if callback is not None:
+            callback()
+
+    def _recognizer_instance(self):
+        with self._lock:
+            if self._recognizer is None:
+                self._audio_config = speechsdk.audio.AudioConfig(use_default_microphone=True)
+                self._recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config,
+                                                              audio_config=self._audio_config)
+            return self._recognizer
+
+    def recognizer(self):
+        """The shared microphone recognizer (also used by the continuous wake-word source)"""
+        return self._recognizer_instance()
+
+    def warm_up(self):
+        """Create the clients and pre-open their connections"""
+        start = time.perf_counter()
+        try:
+            synthesizer_connection = speechsdk.Connection.from_speech_synthesizer(self._synthesizer_instance())
+            synthesizer_connection.open(True)
+            speaker_connection = speechsdk.Connection.from_speech_synthesizer(self._speaker_instance())
+            speaker_connection.open(True)
+            recognizer_connection = speechsdk.Connection.from_recognizer(self._recognizer_instance())
+            recognizer_connection.open(False)
+            self._connections = [synthesizer_connection, speaker_connection, recognizer_connection]
+            print(f"[SPEECH] Session warmed up in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            print(f"[SPEECH] Warm-up failed, clients will connect on first use: {e}")
+
+    def synthesize(self, text):
+        """Synthesize `text` to memory; returns the SpeechSynthesisResult"""
+        start = time.perf_counter()
+        synthesizer = self._synthesizer_instance()
+        setup_done = time.perf_counter()
+        result = synthesizer.speak_text_async(text).get()
+        self._record("synthesize", setup_done - start, time.perf_counter() - setup_done)
+        return result
+
+    def speak(self, text, on_first_audio=None):
+        """
+        Synthesize `text` straight to the default speaker; returns the SpeechSynthesisResult
+
+        on_first_audio() is called (on the SDK's thread) when the first audio chunk arrives.
+        """
+        start = time.perf_counter()
+        synthesizer = self._speaker_instance()
+        setup_done = time.perf_counter()
+        self._on_first_audio = on_first_audio
+        try:
+            result = synthesizer.speak_text_async(text).get()
+        finally:
+            self._on_first_audio = None
+        self._record("speak", setup_done - start, time.perf_counter() - setup_done)
+        return result
+
+    def recognize_once(self):
+        """One recognition from the default microphone; returns the SpeechRecognitionResult"""
+        start = time.perf_counter()
+        recognizer = self._recognizer_instance()
+        setup_done = time.perf_counter()
+        result = recognizer.recognize_once_async().get()
+        self._record("recognize", setup_done - start, time.perf_counter() - setup_done)
+        return result
+
+    def _record(self, kind, setup_secs, work_secs):
+        self.timings.append((kind, setup_secs, work_secs))
+        if PRINT_SPEECH_TIMING:
+            print(f"[TIMING] {kind}: setup {setup_secs:.3f}s | work {work_secs:.2f}s")
@@ -0,0 +1,195 @@
+import threading
+from queue import Queue
+import numpy as np
+from lazy_import import lazy_module
+from phrase_matcher import TOKEN_PATTERN
+
+sr = lazy_module("speech_recognition")
+_prepared_audio_class = None
+
+
+def prepared_audio_class():
+    """PreparedAudioData, defined on first use since it subclasses speech_recognition's AudioData"""
+    global _prepared_audio_class
+    if _prepared_audio_class is None:
+        class PreparedAudioData(sr.AudioData):
+            """AudioData that encodes its FLAC payload once and reuses it across recognize calls"""
+
+            def __init__(self, frame_data, sample_rate, sample_width):
+                super().__init__(frame_data, sample_rate, sample_width)
+                self._flac_cache = {}
+
+            def get_flac_data(self, convert_rate=None, convert_width=None):
+                key = (convert_rate, convert_width)
+                if key not in self._flac_cache:
+                    self._flac_cache[key] = super().get_flac_data(convert_rate, convert_width)
+                return self._flac_cache[key]
+
+        _prepared_audio_class = PreparedAudioData
+    return _prepared_audio_class
+
+
+def prepare_audio_data(pcm, sample_rate, target_rate=16000):
+    """
+    Build recognizer-ready audio from in-memory int16 samples, without a disk round trip
+
+    Resampling to `target_rate` and FLAC encoding both happen here, once, so
+    retries only pay for the network request.
+
+    Returns:
+        PreparedAudioData: Audio ready for recognize_google
+    """
+    audio_data = sr.AudioData(pcm.tobytes(), sample_rate, 2)
+    if target_rate and sample_rate > target_rate:
+        audio_data = sr.AudioData(audio_data.get_raw_data(convert_rate=target_rate), target_rate, 2)
+    prepared = prepared_audio_class()(audio_data.frame_data, audio_data.sample_rate, 2)
+    # Same arguments recognize_google uses, so its call hits the cache
+    prepared.get_flac_data(convert_rate=None if prepared.sample_rate >= 8000 else 8000, convert_width=2)
+    return prepared
+
+
+class RecognizerBackend:
+    """Interface for speech-to-text engines used by StreamingTranscriber"""
+
+    def recognize(self, pcm, sample_rate):
+        """
+        Recognize one chunk of mono int16 audio
+
+        Args:
+            pcm (np.ndarray): int16 samples
+            sample_rate (int): Sample rate of `pcm` in Hz
+
+        Returns:
+            str: Recognized text, or "" if nothing intelligible was heard
+        """
+        raise NotImplementedError
+
+
+class GoogleRecognizerBackend(RecognizerBackend):
+    """speech_recognition's recognize_google, fed from memory"""
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, pcm, sample_rate):
+        audio_data = prepare_audio_data(pcm, sample_rate)
+        try:
+            return self.recognizer.recognize_google(audio_data)
+        except sr.UnknownValueError:
+            return ""
+
+
+class OfflineRecognizerBackend(RecognizerBackend):
+    """Stand-in backend for offline tests: returns scripted phrases, one per segment"""
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self.segments = []
+
+    def recognize(self, pcm, sample_rate):
+        self.segments.append(len(pcm) / sample_rate)
+        return self.phrases.pop(0) if self.phrases else ""
+
+
+class StreamingTranscriber:
+    """BlockConsumer listener that transcribes a recording while it is made.
+
+    The recording is cut into segments at pauses (or every max_segment_sec)
+    and each finished segment is sent to the backend on a worker thread, so
+    only the last segment is still outstanding when the stream closes.
+    Segments are views into the recorder's buffer, never copies.
+    """
+
+    def __init__(self, recorder, backend, silence_level, pause_sec=0.6, max_segment_sec=15.0):
+        self.recorder = recorder
+        self.backend = backend
+        self.silence_level = silence_level
+        self.pause_samples = int(pause_sec * recorder.sample_rate)
+        self.max_segment_samples = int(max_segment_sec * recorder.sample_rate)
+        self.position = 0
+        self.segment_start = 0
+        self.segment_has_speech = False
+        self.silence_samples = 0
+        self.results = []
+        self.spans = []     # (start, end) sample range of each result
+        self.failed = False
+        self._segments = Queue()
+        self._worker = threading.Thread(target=self._recognize_segments, daemon=True)
+        self._worker.start()
+
+    def update(self, block, timestamp=None):
+        self.position += len(block)
+        if np.abs(block).mean() < self.silence_level:
+            self.silence_samples += len(block)
+        else:
+            self.segment_has_speech = True
+            self.silence_samples = 0
+
+        segment_length = self.position - self.segment_start
+        if self.segment_has_speech and (self.silence_samples >= self.pause_samples
+                                        or segment_length >= self.max_segment_samples):
+            self._cut_segment()
+        elif not self.segment_has_speech and self.silence_samples >= self.pause_samples:
+            # Nothing said yet: slide the segment start along instead of sending silence
+            self.segment_start = self.position
+
+    def _cut_segment(self):
+        self.results.append("")
+        self.spans.append((self.segment_start, self.position))
+        self._segments.put((len(self.results) - 1, self.segment_start, self.position))
+        self.segment_start = self.position
+        self.segment_has_speech = False
+        self.silence_samples = 0
+
+    def _recognize_segments(self):
+        while True:
+            segment = self._segments.get()
+            if segment is None:
+                break
+            index, start, end = segment
+            if self.failed:
+                continue
+            try:
+                self.results[index] = self.backend.recognize(self.recorder.audio[start:end],
+                                                             self.recorder.sample_rate)
+            except Exception as e:
+                print(f"\n[TRANSCRIBE] Streaming recognition failed: {e}")
+                self.failed = True
+
+    def finish(self, timeout=None):
+        """
+        Flush the last segment and wait for all recognitions
+
+        Returns:
+            str: Lowercase transcript, or None if recognition failed or heard nothing
+        """
+        if self.segment_has_speech:
+            self._cut_segment()
+        self._segments.put(None)
+        self._worker.join(timeout)
+        if self.failed or self._worker.is_alive():
+            return None
+        text = " ".join(part.strip() for part in self.results if part.strip())
+        return text.lower() or None
+
+    def stop(self):
+        """Abandon the transcription without waiting: pending segments are skipped and the worker exits"""
+        self.failed = True
+        self._segments.put(None)
+
+    def word_times(self):
+        """
+        (start_sec, end_sec) for every word token of the finished transcript
+
+        The recognizer returns no word timestamps, so each segment's words are
+        spread evenly over the segment's span of the recording. Call after
+        finish(); the list lines up with the tokens of its transcript.
+        """
+        rate = self.recorder.sample_rate
+        times = []
+        for text, (start, end) in zip(self.results, self.spans):
+            words = TOKEN_PATTERN.findall(text.lower())
+            step = (end - start) / rate / max(len(words), 1)
+            for i in range(len(words)):
+                times.append((start / rate + i * step, start / rate + (i + 1) * step))
+        return times
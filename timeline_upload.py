@@ -0,0 +1,122 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+# ==== Timeline Protocol ====
+# POST /timeline          {"id": str, "events": [{"id": int, "offset_ms": int, "action": str, "armed": bool}, ...]}
+#                         unarmed events are held and never run until a retime arms them
+# GET  /timeline/start    ?id=<id>&delay_ms=<n>   run the events n ms after this request arrives
+# POST /timeline/retime   {"id": str, "events": [{"id": int, "offset_ms": int}, ...]}   sets and arms
+# GET  /timeline/cancel   drop the timeline and stop
+# Boards without timeline support answer 404 and callers fall back to per-gesture sends.
+
+
+class TimelineUpload:
+    """Runs a whole gesture timeline on the controller instead of one GET per gesture.
+
+    The timeline is sent as one JSON document of relative offsets and then
+    started with a single command, so only that start request is exposed to
+    WiFi jitter; the board's own clock times every gesture after it. Offsets
+    learned later (word-boundary events) are batched into one retime request
+    per sentence. schedule() mirrors GestureScheduler so WordBoundaryGestureSync
+    can drive either. With hold_triggers, trigger-word entries (those with a
+    char_offset) are uploaded unarmed, so an estimate never fires before its
+    word-boundary retime arrives.
+    """
+
+    def __init__(self, client, timeline, lead_sec=0.0, hold_triggers=False):
+        self.client = client
+        self.timeline = timeline
+        self.lead_sec = lead_sec
+        self.hold_triggers = hold_triggers
+        self.timeline_id = uuid.uuid4().hex[:8]
+        self.upload_rtt = None
+        self.started_at = None
+        self.retimes = 0
+        self._pending_retimes = []
+        self._sender = None     # one thread, so requests from callbacks keep their order
+        for event_id, entry in enumerate(timeline):
+            entry["event_id"] = event_id
+
+    def _offset_ms(self, seconds):
+        return int(round(max(seconds - self.lead_sec, 0.0) * 1000))
+
+    def _armed(self, entry):
+        return not (self.hold_triggers and entry.get("char_offset") is not None)
+
+    def upload(self):
+        """Send the full timeline; returns False if the board can't run timelines"""
+        document = {"id": self.timeline_id,
+                    "events": [{"id": entry["event_id"], "offset_ms": self._offset_ms(entry["time"]),
+                                "action": entry["action"], "armed": self._armed(entry)}
+                               for entry in self.timeline]}
+        start = time.perf_counter()
+        try:
+            response = self.client.post_json("/timeline", document)
+        except requests.exceptions.RequestException as e:
+            print(f"[TIMELINE] Upload failed: {e}")
+            return False
+        self.upload_rtt = time.perf_counter() - start
+        if response.status_code != 200:
+            print(f"[TIMELINE] Board refused timeline (status {response.status_code})")
+            return False
+        print(f"[TIMELINE] Uploaded {len(self.timeline)} events in {self.upload_rtt * 1000:.0f} ms")
+        return True
+
+    def start(self, delay_ms=0):
+        """Tell the board to start the uploaded timeline `delay_ms` after it receives this"""
+        self.started_at = time.time()
+        # The board moves on its own from here, so the last confirmed pose is no longer known
+        self.client.applied.pop("/preset", None)
+        try:
+            response = self.client.get("/timeline/start", params={"id": self.timeline_id, "delay_ms": delay_ms})
+            return response.status_code == 200
+        except requests.exceptions.RequestException as e:
+            print(f"[TIMELINE] Start failed: {e}")
+            return False
+
+    def _send_later(self, fn, *args):
+        if self._sender is None:
+            self._sender = ThreadPoolExecutor(max_workers=1, thread_name_prefix="timeline")
+        return self._sender.submit(fn, *args)
+
+    def start_async(self, delay_ms=0):
+        """start() on the sender thread, for callers that must not block (SDK callbacks)"""
+        return self._send_later(self.start, delay_ms)
+
+    def flush_async(self):
+        """flush() on the sender thread"""
+        return self._send_later(self.flush)
+
+    def schedule(self, event):
+        """Queue a corrected offset for an uploaded event (sent by flush())"""
+        self._pending_retimes.append({"id": event["event_id"], "offset_ms": self._offset_ms(event["time"])})
+
+    def flush(self):
+        """Send every queued retime in one request"""
+        if not self._pending_retimes:
+            return True
+        events, self._pending_retimes = self._pending_retimes, []
+        try:
+            response = self.client.post_json("/timeline/retime", {"id": self.timeline_id, "events": events})
+        except requests.exceptions.RequestException as e:
+            print(f"[TIMELINE] Retime failed: {e}")
+            return False
+        self.retimes += len(events)
+        return response.status_code == 200
+
+    def cancel(self):
+        if self._sender is not None:
+            # Drop queued requests and let the one in flight finish, so nothing starts after this
+            self._sender.shutdown(wait=True, cancel_futures=True)
+            self._sender = None
+        try:
+            self.client.get("/timeline/cancel")
+        except requests.exceptions.RequestException as e:
+            print(f"[TIMELINE] Cancel failed: {e}")
+
+    def report(self):
+        rtt = f"{self.upload_rtt * 1000:.0f} ms" if self.upload_rtt is not None else "n/a"
+        print(f"📤 Timeline {self.timeline_id}: {len(self.timeline)} gestures run on-board | "
+              f"upload {rtt} | {self.retimes} retimed from word boundaries")
@@ -1,36 +1,181 @@
-from http.server import BaseHTTPRequestHandler, HTTPServer
-import subprocess
-import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from collections import deque
+import json
 import socket
+import threading
+import time
 
 PORT = 5000
+TOUCH_DEBOUNCE_SEC = 1.0       # Touches closer together than this are sensor bounce
+TOUCH_WHILE_ACTIVE = "reject"  # "reject" or "queue" (at most one session waits)
+
+
+class ControllerWorker:
+    """Warm standby for main_controller, started by touches instead of a new process.
+
+    At startup a background thread imports main_controller (Azure SDK,
+    pygame, the speech session, device clients) so a touch only has to
+    signal it. Touches are debounced, repeated touch ids are dropped, and a
+    touch during a running session is rejected or queued according to
+    TOUCH_WHILE_ACTIVE. If the warm-up fails the worker reports "failed"
+    and the next touch retries it. Each session reports touch-to-first-word
+    latency.
+    """
+
+    def __init__(self, debounce_sec=TOUCH_DEBOUNCE_SEC, while_active=TOUCH_WHILE_ACTIVE):
+        self.debounce_sec = debounce_sec
+        self.while_active = while_active
+        self.state = "warming"
+        self.controller = None
+        self.touches = 0
+        self.debounced = 0
+        self.rejected = 0
+        self.sessions = 0
+        self.first_word_latencies = []
+        self.error = None
+        self._retry_warm_up = False
+        self._last_touch = 0.0
+        self._seen_ids = deque(maxlen=64)  # recent touch ids; the sensor may resend one
+        self._touch_time = None
+        self._queued_touch = None
+        self._wake = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="controller-worker")
+        self._thread.start()
+
+    def _warm_up(self):
+        start = time.perf_counter()
+        import main_controller
+        import speakz_greeting
+        from orchestrator import orchestrator
+        if self._on_speech_start not in speakz_greeting.speech_start_listeners:
+            speakz_greeting.speech_start_listeners.append(self._on_speech_start)
+        speakz_greeting.warm_up_speech(main_controller.CONTROLLER_PHRASES + speakz_greeting.WARMUP_PHRASES)
+        orchestrator.preload()
+        self.controller = main_controller
+        print(f"[WORKER] Controller warmed up in {time.perf_counter() - start:.2f}s, waiting for touch")
+
+    def _warm_up_until_ready(self):
+        while True:
+            try:
+                self._warm_up()
+                self.error = None
+                return
+            except Exception as e:
+                with self._wake:
+                    self.state = "failed"
+                    self.error = f"{type(e).__name__}: {e}"
+                    self._queued_touch = None  # nothing can run it
+                    print(f"[WORKER] Warm-up failed ({self.error}); the next touch retries")
+                    self._wake.wait_for(lambda: self._retry_warm_up)
+                    self._retry_warm_up = False
+                    self.state = "warming"
+
+    def _run(self):
+        self._warm_up_until_ready()
+        while True:
+            with self._wake:
+                self.state = "idle"
+                self._wake.wait_for(lambda: self._queued_touch is not None)
+                self._touch_time, self._queued_touch = self._queued_touch, None
+                self.state = "running"
+            self.sessions += 1
+            print(f"[WORKER] Session {self.sessions} started "
+                  f"{(time.time() - self._touch_time) * 1000:.0f} ms after touch")
+            try:
+                self.controller.main(warmed_up=True)
+            except Exception as e:
+                print(f"[WORKER] Session ended with error: {e}")
+            print(f"[WORKER] Session {self.sessions} finished")
+
+    def _on_speech_start(self, text):
+        touch_time, self._touch_time = self._touch_time, None
+        if touch_time is not None:
+            latency = time.time() - touch_time
+            self.first_word_latencies.append(latency)
+            print(f"[TOUCH] Touch-to-first-word: {latency:.2f}s")
+
+    def touch(self, touch_id=None):
+        """
+        Handle one touch event
+
+        Returns:
+            str: "started", "queued", "debounced", "duplicate", "busy" or "unavailable"
+        """
+        now = time.time()
+        with self._wake:
+            self.touches += 1
+            if touch_id is not None:
+                if touch_id in self._seen_ids:
+                    self.debounced += 1
+                    return "duplicate"
+                self._seen_ids.append(touch_id)
+            if now - self._last_touch < self.debounce_sec:
+                self.debounced += 1
+                return "debounced"
+            self._last_touch = now
+            if self.state == "failed":
+                self.rejected += 1
+                self._retry_warm_up = True
+                self._wake.notify()
+                return "unavailable"
+            if self._queued_touch is not None:
+                self.debounced += 1
+                return "duplicate"
+            if self.state == "running" and self.while_active != "queue":
+                self.rejected += 1
+                return "busy"
+            status = "queued" if self.state == "running" else "started"
+            # Also covers a touch while still warming: the session starts as soon as imports finish
+            self._queued_touch = now
+            self._wake.notify()
+            return status
+
+    def status(self):
+        latencies = self.first_word_latencies
+        return {"state": self.state, "touches": self.touches, "debounced": self.debounced,
+                "rejected": self.rejected, "sessions": self.sessions, "error": self.error,
+                "last_touch_to_first_word_sec": latencies[-1] if latencies else None}
+
+
+worker = ControllerWorker()
+
+TOUCH_RESPONSES = {
+    "started": (200, "Robot started!"),
+    "queued": (202, "Session running, touch queued"),
+    "debounced": (200, "Ignored (debounced)"),
+    "duplicate": (200, "Ignored (duplicate)"),
+    "busy": (409, "Session already running"),
+    "unavailable": (503, "Controller failed to start, retrying"),
+}
+
 
 class TouchHandler(BaseHTTPRequestHandler):
+    def _send_text(self, status, body, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
     def do_GET(self):
         client_ip = self.client_address[0]
         print(f"[REQUEST] from {client_ip}: {self.path}")
-        
-        if self.path == '/touch':
-            print("[TOUCH DETECTED] Launching controller.py...")
-            try:
-                # Run controller.py
-                subprocess.Popen([sys.executable, "main_controller.py"])
-                self.send_response(200)
-                self.send_header('Content-type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(b"Robot started!")
-                print("[SUCCESS] Robot controller launched")
-            except Exception as e:
-                print(f"[ERROR] Failed to launch controller: {e}")
-                self.send_response(500)
-                self.send_header('Content-type', 'text/plain')
-                self.end_headers()
-                self.wfile.write(f"Error: {str(e)}".encode())
+        url = urlparse(self.path)
+
+        if url.path == '/touch':
+            touch_id = parse_qs(url.query).get("id", [None])[0]
+            result = worker.touch(touch_id)
+            status, message = TOUCH_RESPONSES[result]
+            print(f"[TOUCH] {result}: {message}")
+            self._send_text(status, message)
+        elif url.path == '/status':
+            status = worker.status()
+            self._send_text(503 if status["state"] == "failed" else 200, json.dumps(status), 'application/json')
         else:
-            self.send_response(404)
-            self.send_header('Content-type', 'text/plain')
-            self.end_headers()
-            self.wfile.write(b"Not found")
+            self._send_text(404, "Not found")
 
 def get_local_ip():
     """Get the local IP address"""
@@ -44,17 +189,18 @@ def get_local_ip():
 
 if __name__ == "__main__":
     # Bind to all interfaces (0.0.0.0) instead of just localhost
-    server = HTTPServer(('0.0.0.0', PORT), TouchHandler)
+    server = ThreadingHTTPServer(('0.0.0.0', PORT), TouchHandler)
     local_ip = get_local_ip()
-    
+    worker.start()
+
     print(f"Touch Server Starting...")
     print(f"Local IP: {local_ip}")
     print(f"Listening on all interfaces, port {PORT}")
     print(f"ESP32 should connect to: http://{local_ip}:{PORT}/touch")
     print("Press Ctrl+C to stop")
-    
+
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nServer stopped")
-        server.server_close()
\ No newline at end of file
+        server.server_close()
@@ -0,0 +1,21 @@
+import io
+import time
+from lazy_import import lazy_module
+
+pygame = lazy_module("pygame")
+
+
+def init_mixer():
+    """Start the pygame mixer once; later calls are free"""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+
+
+def play_wav_bytes(wav_bytes):
+    """Play in-memory WAV audio and return when it finishes"""
+    init_mixer()
+    sound = pygame.mixer.Sound(file=io.BytesIO(wav_bytes))
+    channel = sound.play()
+    while channel is not None and channel.get_busy():
+        time.sleep(0.01)
+    return sound.get_length()
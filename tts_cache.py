@@ -0,0 +1,76 @@
+import hashlib
+import os
+import threading
+
+
+class TTSCache:
+    """Content-addressed on-disk cache of synthesized speech.
+
+    Each clip is stored under sha256(text, voice, format), so a changed voice
+    or output format never replays stale audio. Hits refresh the file's
+    mtime and, once the directory grows past max_bytes, the least recently
+    used clips are deleted first.
+    """
+
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.total_bytes = sum(entry.stat().st_size for entry in os.scandir(directory)
+                               if entry.name.endswith(".wav"))
+
+    def path_for(self, text, voice, audio_format):
+        digest = hashlib.sha256(f"{voice}\0{audio_format}\0{text}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.wav")
+
+    def get(self, text, voice, audio_format):
+        """Cached audio bytes, or None on a miss"""
+        path = self.path_for(text, voice, audio_format)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, text, voice, audio_format, data):
+        path = self.path_for(text, voice, audio_format)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            existing = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.total_bytes += len(data) - existing
+            if self.total_bytes > self.max_bytes:
+                self._evict(keep=path)
+
+    def _evict(self, keep):
+        entries = sorted((entry for entry in os.scandir(self.directory)
+                          if entry.name.endswith(".wav") and entry.path != keep),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": hit_rate,
+                "evictions": self.evictions, "bytes": self.total_bytes}
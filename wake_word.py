@@ -0,0 +1,244 @@
+import os
+import sys
+import threading
+import time
+from lazy_import import lazy_module
+from phrase_matcher import PhraseMatcher
+
+speechsdk = lazy_module("azure.cognitiveservices.speech")
+
+WAKE_PHRASES = {
+    "hi": "wake",
+    "hey speakz": "wake",
+    "goodbye": "exit",
+    "exit": "exit",
+}
+
+# Azure custom keyword models (.table) run on-device, so nothing goes to the
+# cloud until a phrase is spotted. Single-syllable "hi" can't be a custom
+# keyword, so keyword mode only listens for the phrases below and prompts
+# advertise "Hey Speakz", which works in every mode.
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+WAKE_KEYWORD_MODELS = {
+    "hey speakz": os.path.join(MODELS_DIR, "hey_speakz.table"),
+    "goodbye": os.path.join(MODELS_DIR, "goodbye.table"),
+}
+# Without models, fall back to Azure continuous recognition. That streams the
+# microphone to the cloud while waiting; set False to require the models.
+WAKE_CLOUD_FALLBACK = True
+
+
+class WakeWordDetector:
+    """Sets `detected` the moment a wake/exit phrase shows up in recognized text.
+
+    Sources feed it partial and final hypotheses through feed_text(); the
+    phrase table is matched on whole words, so "this" never counts as "hi".
+    """
+
+    def __init__(self, phrases=WAKE_PHRASES):
+        self.phrases = dict(phrases)
+        self.matcher = PhraseMatcher(phrases)
+        self.detected = threading.Event()
+        self.phrase = None
+        self.action = None
+        self.detected_at = None
+
+    def feed_text(self, text):
+        if self.detected.is_set() or not text:
+            return False
+        matches = self.matcher.find_all(text)
+        if not matches:
+            return False
+        self.trigger(matches[0].phrase)
+        return True
+
+    def trigger(self, phrase):
+        if self.detected.is_set():
+            return
+        self.phrase = phrase
+        self.action = self.phrases.get(phrase)
+        self.detected_at = time.time()
+        self.detected.set()
+
+    def reset(self):
+        self.detected.clear()
+        self.phrase = None
+        self.action = None
+        self.detected_at = None
+
+
+class ContinuousWakeSource:
+    """Azure continuous recognition, checking every intermediate hypothesis.
+
+    No recognize_once round trips or sleeps between attempts; the phrase list
+    biases the recognizer towards the wake phrases. The recognizer is usually
+    the speech session's warm one, so handlers and the phrase list are only
+    attached while waiting and command recognition afterwards is unaffected.
+    """
+
+    def __init__(self, recognizer, detector):
+        self.recognizer = recognizer
+        self.detector = detector
+        self.phrase_list = speechsdk.PhraseListGrammar.from_recognizer(recognizer)
+
+    def start(self):
+        for phrase in self.detector.phrases:
+            self.phrase_list.addPhrase(phrase)
+        self.recognizer.recognizing.connect(lambda evt: self.detector.feed_text(evt.result.text))
+        self.recognizer.recognized.connect(lambda evt: self.detector.feed_text(evt.result.text))
+        self.recognizer.start_continuous_recognition_async().get()
+
+    def stop(self):
+        self.recognizer.stop_continuous_recognition_async().get()
+        self.recognizer.recognizing.disconnect_all()
+        self.recognizer.recognized.disconnect_all()
+        self.phrase_list.clear()
+
+
+class KeywordWakeSource:
+    """On-device keyword spotting with one Azure KeywordRecognizer per model.
+
+    Works fully offline, including on prerecorded WAV files.
+    """
+
+    def __init__(self, models, detector, audio_file=None):
+        self.detector = detector
+        self.spotters = []
+        for phrase, model_path in models.items():
+            audio_config = (speechsdk.audio.AudioConfig(filename=audio_file) if audio_file
+                            else speechsdk.audio.AudioConfig(use_default_microphone=True))
+            self.spotters.append((phrase, speechsdk.KeywordRecognizer(audio_config),
+                                  speechsdk.KeywordRecognitionModel(model_path)))
+        self._futures = []
+
+    def start(self):
+        self._futures = []
+        for phrase, recognizer, model in self.spotters:
+            recognizer.recognized.connect(self._make_handler(phrase))
+            self._futures.append(recognizer.recognize_once_async(model))
+
+    def _make_handler(self, phrase):
+        def handler(evt):
+            if evt.result.reason == speechsdk.ResultReason.RecognizedKeyword:
+                self.detector.trigger(phrase)
+        return handler
+
+    def stop(self):
+        for _, recognizer, _ in self.spotters:
+            recognizer.recognized.disconnect_all()
+            recognizer.stop_recognition_async().get()
+
+
+class TextWakeSource:
+    """Feeds already-transcribed utterances to the detector, entirely locally.
+
+    Lets the wake-word state machine run without a microphone, models or
+    network: each wait consumes utterances until one contains a phrase, and
+    the rest are kept for the next wait.
+    """
+
+    def __init__(self, utterances, detector):
+        self.utterances = list(utterances)
+        self.detector = detector
+
+    def start(self):
+        while self.utterances and not self.detector.detected.is_set():
+            self.detector.feed_text(self.utterances.pop(0))
+
+    def stop(self):
+        pass
+
+
+class WakeWordListener:
+    """Blocks until a wake or exit phrase is heard, using local keywords when available.
+
+    Modes: "text" when utterances are given, "keyword" when on-device models
+    exist (only the phrases that have one), else "continuous" cloud
+    recognition if WAKE_CLOUD_FALLBACK allows it. The source is built once
+    and reused for every wait.
+    """
+
+    def __init__(self, speech_config=None, models=WAKE_KEYWORD_MODELS, audio_file=None, session=None,
+                 utterances=None):
+        self.speech_config = speech_config
+        self.session = session
+        self.models = {phrase: path for phrase, path in models.items() if os.path.exists(path)}
+        self.audio_file = audio_file
+        self.utterances = utterances
+        if utterances is not None:
+            self.mode = "text"
+            phrases = WAKE_PHRASES
+        elif self.models:
+            self.mode = "keyword"
+            phrases = {phrase: WAKE_PHRASES[phrase] for phrase in self.models}
+            unsupported = sorted(set(WAKE_PHRASES) - set(phrases))
+            print(f"[WAKE] Keyword mode: no on-device model for {', '.join(repr(p) for p in unsupported)}, "
+                  f"not listening for them")
+        elif WAKE_CLOUD_FALLBACK:
+            self.mode = "continuous"
+            phrases = WAKE_PHRASES
+            print("[WAKE] No keyword models in models/, wake words are recognized in the cloud")
+        else:
+            raise RuntimeError(f"No wake keyword models found in {MODELS_DIR} and WAKE_CLOUD_FALLBACK is off")
+        self.detector = WakeWordDetector(phrases)
+        self._source = None
+
+    @property
+    def prompt(self):
+        wake = [phrase for phrase, action in self.detector.phrases.items() if action == "wake"]
+        return "Say " + " or ".join(f"'{phrase.title()}'" for phrase in wake) + " to start."
+
+    def _make_source(self):
+        if self.mode == "text":
+            return TextWakeSource(self.utterances, self.detector)
+        if self.mode == "keyword":
+            return KeywordWakeSource(self.models, self.detector, self.audio_file)
+        if self.audio_file:
+            audio_config = speechsdk.audio.AudioConfig(filename=self.audio_file)
+            recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config, audio_config=audio_config)
+        elif self.session is not None:
+            recognizer = self.session.recognizer()
+        else:
+            recognizer = speechsdk.SpeechRecognizer(speech_config=self.speech_config,
+                                                    audio_config=speechsdk.audio.AudioConfig(use_default_microphone=True))
+        return ContinuousWakeSource(recognizer, self.detector)
+
+    def wait_for_wake(self, timeout=None):
+        """
+        Listen until a phrase is detected
+
+        Returns:
+            str: "wake" or "exit", or None on timeout
+        """
+        self.detector.reset()
+        if self._source is None:
+            self._source = self._make_source()
+        self._source.start()
+        try:
+            self.detector.detected.wait(timeout)
+        finally:
+            # Free the microphone for the cloud recognizer that runs after wake
+            self._source.stop()
+        if not self.detector.detected.is_set():
+            return None
+        print(f"[WAKE] Heard '{self.detector.phrase}' ({self.mode})")
+        return self.detector.action
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python wake_word.py <recording.wav> | --text <utterance> [<utterance> ...]")
+        sys.exit(1)
+    if sys.argv[1] == "--text":
+        # Offline check of the state machine: one wait per detected phrase until the utterances run out
+        listener = WakeWordListener(utterances=sys.argv[2:])
+        while True:
+            result = listener.wait_for_wake(timeout=0)
+            print(f"[WAKE] Result: {result}")
+            if result is None:
+                break
+        sys.exit(0)
+    from speakz_greeting import get_speech_config
+    listener = WakeWordListener(get_speech_config(), audio_file=sys.argv[1])
+    print(f"[WAKE] Scanning {sys.argv[1]} in {listener.mode} mode...")
+    print(f"[WAKE] Result: {listener.wait_for_wake(timeout=30)}")
@@ -0,0 +1,70 @@
+import re
+import time
+from collections import deque
+
+WORD_PATTERN = re.compile(r"\S+")
+
+
+class WordBoundaryGestureSync:
+    """Releases timeline gestures as the synthesizer reaches their trigger words.
+
+    Timeline entries with a "char_offset" (where the trigger word starts in
+    the spoken text) are held back until a word-boundary event covers that
+    offset, then scheduled at the word's real audio offset instead of the
+    estimated "time". The difference between the two is recorded as drift.
+    Entries without a char_offset are left to the caller.
+    """
+
+    def __init__(self, scheduler, timeline):
+        self.scheduler = scheduler
+        self.pending = deque(sorted((entry for entry in timeline if entry.get("char_offset") is not None),
+                                    key=lambda entry: entry["char_offset"]))
+        self.drift = []
+
+    def on_word_boundary(self, text_offset, word_length, audio_offset_sec):
+        """Handle one boundary: the word at `text_offset` starts `audio_offset_sec` into the audio"""
+        while self.pending and self.pending[0]["char_offset"] < text_offset + word_length:
+            entry = self.pending.popleft()
+            self.drift.append(audio_offset_sec - entry["time"])
+            self.scheduler.schedule(dict(entry, time=audio_offset_sec, estimated_time=entry["time"]))
+
+    def azure_handler(self, evt):
+        """Adapter for SpeechSynthesizer.synthesis_word_boundary (audio_offset is in 100 ns ticks)"""
+        self.on_word_boundary(evt.text_offset, evt.word_length, evt.audio_offset / 10_000_000)
+
+    def drift_summary(self):
+        """(gestures, mean |drift|, max |drift|, drift of the last gesture) in seconds"""
+        if not self.drift:
+            return 0, 0.0, 0.0, 0.0
+        magnitudes = [abs(d) for d in self.drift]
+        return len(self.drift), sum(magnitudes) / len(magnitudes), max(magnitudes), self.drift[-1]
+
+
+class SyntheticWordBoundarySource:
+    """Offline stand-in for the synthesizer's word-boundary events.
+
+    Emits one (text_offset, word_length, audio_offset_sec) event per word at
+    a fixed speaking rate plus a pause after punctuation, so gesture sync can
+    be exercised and its drift measured without Azure or speakers.
+    """
+
+    def __init__(self, words_per_sec=2.2, punctuation_pause_sec=0.4):
+        self.words_per_sec = words_per_sec
+        self.punctuation_pause_sec = punctuation_pause_sec
+
+    def events(self, text):
+        offset_sec = 0.0
+        for match in WORD_PATTERN.finditer(text):
+            word = match.group()
+            yield match.start(), len(word), offset_sec
+            offset_sec += 1 / self.words_per_sec
+            if word[-1] in ".!?,":
+                offset_sec += self.punctuation_pause_sec
+
+    def play(self, text, handler, realtime=False):
+        """Feed every event to handler(text_offset, word_length, audio_offset_sec)"""
+        start = time.time()
+        for text_offset, word_length, audio_offset_sec in self.events(text):
+            if realtime:
+                time.sleep(max(start + audio_offset_sec - time.time(), 0))
+            handler(text_offset, word_length, audio_offset_sec)